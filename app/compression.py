@@ -0,0 +1,80 @@
+"""
+Request body decompression middleware
+Lets clients send large batch payloads with Content-Encoding: gzip
+"""
+import json
+import zlib
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bound on a decompressed body, so a small gzip bomb cannot exhaust memory
+MAX_DECOMPRESSED_BYTES = 16 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """
+    ASGI middleware that transparently inflates gzip-encoded request bodies
+    Requests without Content-Encoding: gzip pass through untouched
+    """
+    
+    def __init__(self, app: ASGIApp, max_size: int = MAX_DECOMPRESSED_BYTES):
+        self.app = app
+        self.max_size = max_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope["headers"])
+        if headers.get(b"content-encoding", b"").lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+        
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        
+        try:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            body = decompressor.decompress(b"".join(chunks), self.max_size)
+            if decompressor.unconsumed_tail:
+                raise ValueError("Decompressed body too large")
+        except (zlib.error, ValueError) as e:
+            await _send_error(send, 400, f"Invalid gzip request body: {str(e)}")
+            return
+        
+        # Drop the encoding and fix the length so the app sees a plain body
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode())]
+        
+        sent = False
+        
+        async def receive_body() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        await self.app(scope, receive_body, send)
+
+
+async def _send_error(send: Send, status: int, detail: str):
+    """Send a JSON error response matching FastAPI's HTTPException shape"""
+    payload = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
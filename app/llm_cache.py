@@ -0,0 +1,160 @@
+"""
+Response caches for LLM enhancement calls
+Exact-match cache keyed by SHA256 of (method, model, prompt) with TTL expiry,
+plus an optional semantic cache for paraphrased explanation requests
+"""
+import time
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+class LLMCache:
+    """
+    Thread-safe TTL cache for parsed LLM responses
+    Evicts the least recently used entry once maxsize is reached
+    """
+    
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = Lock()
+    
+    @staticmethod
+    def make_key(method: str, model: str, prompt: str) -> bytes:
+        """
+        Build a cache key for an LLM call
+        
+        Args:
+            method: Enhancer method name
+            model: Model identifier used for the call
+            prompt: Full prompt sent to the model
+        
+        Returns:
+            SHA256 digest of the combined inputs
+        """
+        return hashlib.sha256(f"{method}:{model}:{prompt}".encode()).digest()
+    
+    def get(self, key: bytes) -> Optional[Dict]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: bytes, value: Dict):
+        """Store value under key, evicting the oldest entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """
+    Similarity cache for sentiment explanations
+    Embeds texts with a sentence-transformer and searches a separate FAISS
+    inner-product index per bucket. Callers pick the bucket (provider, model
+    and predicted sentiment), so a positive query never matches a negative
+    entry and one model's answer is never served for another.
+    
+    All methods block (encoding, FAISS search), so call them off the event loop.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        maxsize: int = 1000
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._encoder = None
+        self._buckets: Dict[str, Tuple["faiss.Index", List["np.ndarray"], List[Dict]]] = {}
+        self._lock = Lock()
+        self._encoder_lock = Lock()
+    
+    def embed(self, text: str) -> "np.ndarray":
+        """
+        Encode text as an L2-normalized embedding
+        
+        The encoder is loaded on first use to keep startup fast.
+        """
+        if self._encoder is None:
+            with self._encoder_lock:
+                if self._encoder is None:
+                    self._encoder = SentenceTransformer(self.model_name)
+        vector = self._encoder.encode([text], normalize_embeddings=True)
+        return np.asarray(vector, dtype="float32")
+    
+    def get(self, vector: "np.ndarray", bucket: str) -> Optional[Dict]:
+        """Return the closest cached value in bucket above the threshold, if any"""
+        with self._lock:
+            entries = self._buckets.get(bucket)
+            if entries is None or entries[0].ntotal == 0:
+                return None
+            
+            index, _, payloads = entries
+            scores, ids = index.search(vector, 1)
+            if ids[0][0] >= 0 and scores[0][0] >= self.threshold:
+                return payloads[ids[0][0]]
+            return None
+    
+    def set(self, vector: "np.ndarray", bucket: str, value: Dict):
+        """Store value for vector in bucket, dropping its oldest tenth of entries when full"""
+        with self._lock:
+            if bucket not in self._buckets:
+                self._buckets[bucket] = (faiss.IndexFlatIP(vector.shape[1]), [], [])
+            index, vectors, payloads = self._buckets[bucket]
+            
+            if len(payloads) >= self.maxsize:
+                drop = max(1, self.maxsize // 10)
+                del vectors[:drop]
+                del payloads[:drop]
+                index.reset()
+                if vectors:
+                    index.add(np.vstack(vectors))
+            
+            index.add(vector)
+            vectors.append(vector)
+            payloads.append(value)
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._buckets.clear()
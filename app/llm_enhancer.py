@@ -3,28 +3,52 @@ LLM Enhancement Module - Groq and Gemini Integration
 Provides advanced sentiment analysis with explanations and multi-language support
 """
 import os
+import re
 import json
 import asyncio
-from typing import Dict, Optional, List
+from functools import lru_cache
+from typing import Dict, Optional, List, Tuple
 from enum import Enum
 
+import httpx
+
 try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
+    import orjson
+    _loads = orjson.loads
 except ImportError:
-    GROQ_AVAILABLE = False
+    _loads = json.loads
 
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
 except ImportError:
-    GEMINI_AVAILABLE = False
+    TIKTOKEN_AVAILABLE = False
 
 from app.logger import get_logger
 from app.mock_llm import mock_enhancer
+from app.llm_cache import LLMCache, SemanticCache, SEMANTIC_CACHE_AVAILABLE
+from app.rate_limit import ProviderRateLimiter
 
 logger = get_logger(__name__)
 
+GROQ_MODEL = "llama-3.3-70b-versatile"
+GEMINI_MODEL = "gemini-pro"
+MAX_OUTPUT_TOKENS = 1000
+EXPLANATION_BATCH_SIZE = 10
+# Output budget per text in a batched explanation request; the prompt asks for
+# one-sentence fields so a full chunk stays within provider output caps
+EXPLANATION_TOKENS_PER_ITEM = 200
+
+# Input texts longer than this are truncated before being sent for explanation;
+# if less than MIN_KEPT_FRACTION would remain, the mock enhancer is used instead
+MAX_TEXT_TOKENS = 4000
+MIN_KEPT_FRACTION = 0.2
+TRUNCATION_MARKER = " ...[truncated]"
+
+# Shared connection pool so repeated calls reuse warm TLS sessions
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=90)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
 
 class LLMProvider(str, Enum):
     """Available LLM providers"""
@@ -33,6 +57,106 @@ class LLMProvider(str, Enum):
     AUTO = "auto"
 
 
+DEFAULT_SYSTEM_PROMPT = "You are a sentiment analysis expert. Always respond with valid JSON."
+
+# Static instructions are sent as the system message so providers can reuse
+# the cached prefix across requests; only the text and prediction vary
+EXPLANATION_SYSTEM_PROMPT = DEFAULT_SYSTEM_PROMPT + """
+
+Analyze the sentiment prediction in the user message by examining ONLY the actual words present in the text.
+
+CRITICAL RULES:
+1. Quote ONLY words that actually appear in the text - do not invent or assume content
+2. For EACH key phrase, determine if it's positive or negative and estimate its sentiment weight (0-100%)
+3. Analyze the ACTUAL sentiment of the words, not just what the model predicted
+4. The model prediction shows what the ML model thinks, but you should analyze what the words actually mean
+5. Explain why certain phrases have the sentiment they do based on their actual meaning
+
+Provide a JSON response with:
+1. explanation: Detailed explanation of the ACTUAL sentiment in the text based on the words present
+2. key_phrases_detailed: Array of objects with phrase, sentiment (positive/negative), and score (0-100) based on actual word meaning
+   Example: [{"phrase": "disappointed", "sentiment": "negative", "score": 95}, {"phrase": "amazed", "sentiment": "positive", "score": 75}]
+3. overall_score: Overall sentiment breakdown based on analyzing all phrases {"positive": X, "negative": Y}
+4. tone: Emotional intensity based on actual words used
+5. context: What specific aspects are mentioned (quote actual topics from text)
+6. evidence: Quote SPECIFIC words and explain their actual sentiment meaning
+7. dominant_factor: Which phrase/word has the most sentiment weight and why
+8. reasoning: Explain the actual sentiment composition of the text
+9. suggestions: If negative sentiment detected, how to address the concerns mentioned
+
+Format:
+{
+    "explanation": "Explanation of actual sentiment based on word meanings",
+    "key_phrases_detailed": [
+        {"phrase": "actual word/phrase", "sentiment": "positive|negative", "score": 0-100}
+    ],
+    "overall_score": {"positive": X, "negative": Y},
+    "tone": "emotional description based on actual words",
+    "context": "actual aspects mentioned in text",
+    "evidence": "Quoted words with their actual sentiment meanings",
+    "dominant_factor": "Which word/phrase carries most sentiment weight",
+    "reasoning": "Explanation of actual sentiment composition",
+    "suggestions": ["specific suggestion 1", "specific suggestion 2"]
+}"""
+
+# Outermost JSON object/array in an LLM reply that may carry prose or code fences
+JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+JSON_ARRAY_PATTERN = re.compile(r'\[.*\]', re.DOTALL)
+
+def _explanation_defaults() -> Dict:
+    """Fallback explanation fields, built fresh so callers never share the lists and dicts"""
+    return {
+        "explanation": "No explanation provided",
+        "key_phrases_detailed": [],
+        "overall_score": {"positive": 0, "negative": 0, "neutral": 0},
+        "tone": "neutral",
+        "context": "general",
+        "evidence": "No specific evidence provided",
+        "dominant_factor": "Not specified",
+        "reasoning": "No detailed reasoning provided",
+        "suggestions": []
+    }
+
+# Requests/tokens per minute for each provider's default tier
+PROVIDER_QUOTAS = {
+    LLMProvider.GROQ: {"rpm": 30, "tpm": 30000},
+    LLMProvider.GEMINI: {"rpm": 60, "tpm": 100000},
+}
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer used for token estimates (cached after first call)"""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or approximate at ~4 characters per token"""
+    if TIKTOKEN_AVAILABLE:
+        return len(_get_encoding().encode(text))
+    return len(text) // 4 + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_TEXT_TOKENS) -> Tuple[str, float]:
+    """
+    Truncate text to at most max_tokens tokens
+    
+    Returns:
+        Tuple of (possibly truncated text, fraction of the original kept)
+    """
+    if TIKTOKEN_AVAILABLE:
+        encoding = _get_encoding()
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text, 1.0
+        return encoding.decode(tokens[:max_tokens]) + TRUNCATION_MARKER, max_tokens / len(tokens)
+    
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text, 1.0
+    return text[:max_chars] + TRUNCATION_MARKER, max_chars / len(text)
+
+
 class LLMEnhancer:
     """
     Enhances sentiment analysis with LLM-powered insights
@@ -42,37 +166,105 @@ class LLMEnhancer:
     def __init__(self):
         self.groq_client = None
         self.gemini_model = None
-        self._initialize_clients()
+        self._http: Optional[httpx.AsyncClient] = None
+        # Clients are created on first use; only the keys are read up front
+        self._groq_key = os.getenv("GROQ_API_KEY")
+        self._gemini_key = os.getenv("GOOGLE_API_KEY")
+        self._init_lock = asyncio.Lock()
+        self.rate_limiters = {
+            provider: ProviderRateLimiter(**quota)
+            for provider, quota in PROVIDER_QUOTAS.items()
+        }
+        self.cache = LLMCache(
+            maxsize=int(os.getenv("LLM_CACHE_MAXSIZE", "1000")),
+            ttl=float(os.getenv("LLM_CACHE_TTL", "3600"))
+        )
+        self.semantic_cache = None
+        if SEMANTIC_CACHE_AVAILABLE and os.getenv("LLM_SEMANTIC_CACHE", "true").lower() == "true":
+            self.semantic_cache = SemanticCache(
+                threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+            )
+    
+    def _initialize_groq(self):
+        """
+        Initialize the Groq client
+        
+        Provider SDKs are imported here rather than at module level, so only
+        providers that are actually used pay their import cost
+        """
+        try:
+            from groq import AsyncGroq
+            self._http = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            self.groq_client = AsyncGroq(api_key=self._groq_key, http_client=self._http)
+            logger.info("Groq client initialized successfully")
+        except ImportError:
+            logger.warning("GROQ_API_KEY is set but the groq package is not installed")
+            self._groq_key = None
+        except Exception as e:
+            logger.warning(f"Failed to initialize Groq: {e}")
+            self._groq_key = None
     
-    def _initialize_clients(self):
-        """Initialize available LLM clients"""
-        # Initialize Groq
-        groq_key = os.getenv("GROQ_API_KEY")
-        if groq_key and GROQ_AVAILABLE:
-            try:
-                self.groq_client = Groq(api_key=groq_key)
-                logger.info("Groq client initialized successfully")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Groq: {e}")
+    def _initialize_gemini(self):
+        """Initialize the Gemini model"""
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=self._gemini_key)
+            self.gemini_model = genai.GenerativeModel(GEMINI_MODEL)
+            logger.info("Gemini client initialized successfully")
+        except ImportError:
+            logger.warning("GOOGLE_API_KEY is set but google-generativeai is not installed")
+            self._gemini_key = None
+        except Exception as e:
+            logger.warning(f"Failed to initialize Gemini: {e}")
+            self._gemini_key = None
+    
+    async def _ensure_provider(self, provider: LLMProvider) -> LLMProvider:
+        """
+        Create the client for a provider on first use
         
-        # Initialize Gemini
-        gemini_key = os.getenv("GOOGLE_API_KEY")
-        if gemini_key and GEMINI_AVAILABLE:
-            try:
-                genai.configure(api_key=gemini_key)
-                self.gemini_model = genai.GenerativeModel('gemini-pro')
-                logger.info("Gemini client initialized successfully")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Gemini: {e}")
+        Args:
+            provider: Requested provider (AUTO is resolved)
+        
+        Returns:
+            The concrete provider that will serve the request
+        """
+        chosen = self._resolve_provider(provider)
+        if chosen == LLMProvider.GROQ and self.groq_client is None:
+            async with self._init_lock:
+                if self.groq_client is None and self._groq_key:
+                    self._initialize_groq()
+        elif chosen == LLMProvider.GEMINI and self.gemini_model is None:
+            async with self._init_lock:
+                if self.gemini_model is None and self._gemini_key:
+                    self._initialize_gemini()
+        return chosen
+    
+    async def close(self):
+        """Close pooled HTTP connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
     
     def is_available(self, provider: LLMProvider = LLMProvider.AUTO) -> bool:
         """Check if LLM enhancement is available"""
         if provider == LLMProvider.GROQ:
-            return self.groq_client is not None
+            return self._groq_key is not None
         elif provider == LLMProvider.GEMINI:
-            return self.gemini_model is not None
+            return self._gemini_key is not None
         else:  # AUTO
-            return self.groq_client is not None or self.gemini_model is not None
+            return self._groq_key is not None or self._gemini_key is not None
+    
+    def _resolve_provider(self, provider: LLMProvider) -> LLMProvider:
+        """Resolve AUTO to the concrete provider that will serve a request"""
+        if provider == LLMProvider.AUTO:
+            return LLMProvider.GROQ if self._groq_key else LLMProvider.GEMINI
+        return provider
+    
+    def _model_name(self, provider: LLMProvider) -> str:
+        """Resolve the model that will serve a request for the given provider"""
+        if self._resolve_provider(provider) == LLMProvider.GROQ:
+            return GROQ_MODEL
+        return GEMINI_MODEL
     
     async def explain_sentiment(
         self,
@@ -97,22 +289,94 @@ class LLMEnhancer:
             logger.info("LLM not available, using mock enhancer")
             return mock_enhancer.explain_sentiment(text, sentiment, confidence)
         
-        prompt = self._build_explanation_prompt(text, sentiment, confidence)
+        prompt_text, kept = truncate_to_tokens(text)
+        if kept < MIN_KEPT_FRACTION:
+            logger.info(f"Text too long for LLM explanation ({kept:.0%} would be kept), using mock enhancer")
+            return mock_enhancer.explain_sentiment(text, sentiment, confidence)
+        
+        prompt = self._build_explanation_prompt(prompt_text, sentiment, confidence)
+        cache_key = LLMCache.make_key("explain_sentiment", self._model_name(provider), prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Fall back to a similarity lookup for paraphrased texts; encoding
+        # (and loading the encoder on first use) blocks, so it runs in a thread
+        vector = None
+        if self.semantic_cache:
+            bucket = f"{self._resolve_provider(provider).value}:{self._model_name(provider)}:{sentiment}"
+            vector = await asyncio.to_thread(self.semantic_cache.embed, text)
+            cached = await asyncio.to_thread(self.semantic_cache.get, vector, bucket)
+            if cached is not None:
+                return cached
         
         try:
-            if provider == LLMProvider.GROQ or (provider == LLMProvider.AUTO and self.groq_client):
-                response = await self._query_groq(prompt)
-            elif provider == LLMProvider.GEMINI or (provider == LLMProvider.AUTO and self.gemini_model):
-                response = await self._query_gemini(prompt)
-            else:
-                return {"error": "No LLM provider available"}
+            response = await self._query(provider, prompt, system_prompt=EXPLANATION_SYSTEM_PROMPT)
             
-            return self._parse_explanation_response(response)
+            result = self._parse_explanation_response(response)
+            self.cache.set(cache_key, result)
+            if vector is not None:
+                await asyncio.to_thread(self.semantic_cache.set, vector, bucket, result)
+            return result
         
         except Exception as e:
             logger.warning(f"LLM enhancement failed, falling back to mock: {e}")
             return mock_enhancer.explain_sentiment(text, sentiment, confidence)
     
+    async def explain_sentiments_batch(
+        self,
+        items: List[Dict],
+        provider: LLMProvider = LLMProvider.AUTO
+    ) -> List[Dict]:
+        """
+        Generate explanations for many predictions with one LLM call per chunk
+        
+        Args:
+            items: Dicts with text, sentiment and confidence
+            provider: LLM provider to use
+        
+        Returns:
+            List of explanation dicts in the same order as items
+        """
+        if not self.is_available(provider):
+            logger.info("LLM not available, using mock enhancer for batch explanations")
+            return [
+                mock_enhancer.explain_sentiment(item["text"], item["sentiment"], item["confidence"])
+                for item in items
+            ]
+        
+        chunks = [
+            items[i:i + EXPLANATION_BATCH_SIZE]
+            for i in range(0, len(items), EXPLANATION_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._explain_chunk(chunk, provider) for chunk in chunks)
+        )
+        return [explanation for chunk in results for explanation in chunk]
+    
+    async def _explain_chunk(self, items: List[Dict], provider: LLMProvider) -> List[Dict]:
+        """Explain one chunk of predictions in a single LLM request"""
+        prompt = self._build_batch_explanation_prompt(items)
+        cache_key = LLMCache.make_key("explain_sentiments_batch", self._model_name(provider), prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        max_tokens = EXPLANATION_TOKENS_PER_ITEM * len(items)
+        try:
+            response = await self._query(provider, prompt, max_tokens=max_tokens)
+            
+            results = self._parse_batch_explanation_response(response, len(items))
+            self.cache.set(cache_key, results)
+            return results
+        
+        except Exception as e:
+            logger.warning(f"Batch explanation failed, falling back to mock: {e}")
+            return [
+                mock_enhancer.explain_sentiment(item["text"], item["sentiment"], item["confidence"])
+                for item in items
+            ]
+    
     async def analyze_batch_insights(
         self,
         texts: List[str],
@@ -135,14 +399,17 @@ class LLMEnhancer:
             return mock_enhancer.analyze_batch_insights(texts, sentiments)
         
         prompt = self._build_batch_insights_prompt(texts, sentiments)
+        cache_key = LLMCache.make_key("analyze_batch_insights", self._model_name(provider), prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            if provider == LLMProvider.GROQ or (provider == LLMProvider.AUTO and self.groq_client):
-                response = await self._query_groq(prompt)
-            else:
-                response = await self._query_gemini(prompt)
+            response = await self._query(provider, prompt)
             
-            return self._parse_insights_response(response)
+            result = self._parse_insights_response(response)
+            self.cache.set(cache_key, result)
+            return result
         
         except Exception as e:
             logger.warning(f"Batch insights failed, falling back to mock: {e}")
@@ -179,64 +446,74 @@ Respond in JSON format:
     "is_english": true/false,
     "translated_text": "translation or original"
 }}"""
+        cache_key = LLMCache.make_key("detect_language_and_translate", self._model_name(provider), prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            if provider == LLMProvider.GROQ or (provider == LLMProvider.AUTO and self.groq_client):
-                response = await self._query_groq(prompt)
-            else:
-                response = await self._query_gemini(prompt)
+            response = await self._query(provider, prompt)
             
-            return json.loads(response)
+            result = _loads(response)
+            self.cache.set(cache_key, result)
+            return result
         
         except Exception as e:
             logger.warning(f"Language detection failed, using mock: {e}")
             return mock_enhancer.detect_language(text)
     
-    def _build_explanation_prompt(self, text: str, sentiment: str, confidence: float) -> str:
-        """Build prompt for sentiment explanation"""
-        return f"""Analyze this sentiment prediction by examining ONLY the actual words present in the text:
-
-Text: "{text}"
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _build_explanation_prompt(text: str, sentiment: str, confidence: float) -> str:
+        """Build the per-request part of the explanation prompt (memoized for repeats)"""
+        return f"""Text: "{text}"
 Predicted Sentiment: {sentiment}
-Confidence: {confidence:.2%}
+Confidence: {confidence:.2%}"""
+
+    def _build_batch_explanation_prompt(self, items: List[Dict]) -> str:
+        """Build prompt for explaining several predictions at once"""
+        inputs = json.dumps([
+            {
+                "index": i,
+                "text": item["text"],
+                "sentiment": item["sentiment"],
+                "confidence": round(item["confidence"], 4)
+            }
+            for i, item in enumerate(items)
+        ], ensure_ascii=False)
+        
+        return f"""Analyze these {len(items)} sentiment predictions by examining ONLY the actual words present in each text:
+
+{inputs}
 
 CRITICAL RULES:
-1. Quote ONLY words that actually appear in the text - do not invent or assume content
+1. Quote ONLY words that actually appear in each text - do not invent or assume content
 2. For EACH key phrase, determine if it's positive or negative and estimate its sentiment weight (0-100%)
 3. Analyze the ACTUAL sentiment of the words, not just what the model predicted
-4. The model prediction shows what the ML model thinks, but you should analyze what the words actually mean
-5. Explain why certain phrases have the sentiment they do based on their actual meaning
+4. Keep each text field to one short sentence and list at most 3 key phrases and 2 suggestions
 
-Provide a JSON response with:
-1. explanation: Detailed explanation of the ACTUAL sentiment in the text based on the words present
-2. key_phrases_detailed: Array of objects with phrase, sentiment (positive/negative), and score (0-100) based on actual word meaning
-   Example: [{{"phrase": "disappointed", "sentiment": "negative", "score": 95}}, {{"phrase": "amazed", "sentiment": "positive", "score": 75}}]
-3. overall_score: Overall sentiment breakdown based on analyzing all phrases {{"positive": X, "negative": Y}}
-4. tone: Emotional intensity based on actual words used
-5. context: What specific aspects are mentioned (quote actual topics from text)
-6. evidence: Quote SPECIFIC words and explain their actual sentiment meaning
-7. dominant_factor: Which phrase/word has the most sentiment weight and why
-8. reasoning: Explain the actual sentiment composition of the text
-9. suggestions: If negative sentiment detected, how to address the concerns mentioned
+Return a JSON array with exactly {len(items)} objects, one per input in the same order:
+[
+    {{
+        "index": 0,
+        "explanation": "Explanation of actual sentiment based on word meanings",
+        "key_phrases_detailed": [
+            {{"phrase": "actual word/phrase", "sentiment": "positive|negative", "score": 0-100}}
+        ],
+        "overall_score": {{"positive": X, "negative": Y}},
+        "tone": "emotional description based on actual words",
+        "context": "actual aspects mentioned in text",
+        "evidence": "Quoted words with their actual sentiment meanings",
+        "dominant_factor": "Which word/phrase carries most sentiment weight",
+        "reasoning": "Explanation of actual sentiment composition",
+        "suggestions": ["specific suggestion 1", "specific suggestion 2"]
+    }}
+]"""
 
-Format:
-{{
-    "explanation": "Explanation of actual sentiment based on word meanings",
-    "key_phrases_detailed": [
-        {{"phrase": "actual word/phrase", "sentiment": "positive|negative", "score": 0-100}}
-    ],
-    "overall_score": {{"positive": X, "negative": Y}},
-    "tone": "emotional description based on actual words",
-    "context": "actual aspects mentioned in text",
-    "evidence": "Quoted words with their actual sentiment meanings",
-    "dominant_factor": "Which word/phrase carries most sentiment weight",
-    "reasoning": "Explanation of actual sentiment composition",
-    "suggestions": ["specific suggestion 1", "specific suggestion 2"]
-}}"""
-    
-    def _build_batch_insights_prompt(self, texts: List[str], sentiments: List[str]) -> str:
+    @staticmethod
+    def _build_batch_insights_prompt(texts: List[str], sentiments: List[str]) -> str:
         """Build prompt for batch insights"""
-        items = "\n".join([f"{i+1}. [{s}] {t}" for i, (t, s) in enumerate(zip(texts, sentiments))])
+        items = "\n".join(f"{i}. [{s}] {t}" for i, (t, s) in enumerate(zip(texts, sentiments), 1))
         
         return f"""Analyze these sentiment predictions and provide overall insights:
 
@@ -253,71 +530,76 @@ Format:
     "trends": {{"positive": X, "negative": Y}},
     "patterns": ["pattern1", "pattern2", ...]
 }}"""
+
+    async def _query(self, provider: LLMProvider, prompt: str, **kwargs) -> str:
+        """Send prompt to the resolved provider, creating its client if needed"""
+        chosen = await self._ensure_provider(provider)
+        if chosen == LLMProvider.GROQ and self.groq_client is not None:
+            return await self._query_groq(prompt, **kwargs)
+        if chosen == LLMProvider.GEMINI and self.gemini_model is not None:
+            return await self._query_gemini(prompt, **kwargs)
+        raise RuntimeError(f"LLM provider '{chosen.value}' is not available")
+    
+    @staticmethod
+    def _estimate_tokens(prompt: str, max_tokens: int = MAX_OUTPUT_TOKENS) -> int:
+        """Prompt + completion token estimate for rate limiting"""
+        return count_tokens(prompt) + max_tokens
     
-    async def _query_groq(self, prompt: str) -> str:
+    async def _query_groq(
+        self,
+        prompt: str,
+        max_tokens: int = MAX_OUTPUT_TOKENS,
+        system_prompt: str = DEFAULT_SYSTEM_PROMPT
+    ) -> str:
         """Query Groq API"""
-        loop = asyncio.get_event_loop()
-        
-        def _make_request():
-            response = self.groq_client.chat.completions.create(
+        estimated_tokens = self._estimate_tokens(system_prompt + prompt, max_tokens)
+        async with self.rate_limiters[LLMProvider.GROQ].limit(estimated_tokens):
+            response = await self.groq_client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a sentiment analysis expert. Always respond with valid JSON."
+                        "content": system_prompt
                     },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                model="llama-3.3-70b-versatile",
+                model=GROQ_MODEL,
                 temperature=0.3,
-                max_tokens=1000
+                max_tokens=max_tokens
             )
-            return response.choices[0].message.content
-        
-        return await loop.run_in_executor(None, _make_request)
+        return response.choices[0].message.content
     
-    async def _query_gemini(self, prompt: str) -> str:
+    async def _query_gemini(
+        self,
+        prompt: str,
+        max_tokens: int = MAX_OUTPUT_TOKENS,
+        system_prompt: Optional[str] = None
+    ) -> str:
         """Query Gemini API"""
-        loop = asyncio.get_event_loop()
-        
-        def _make_request():
-            response = self.gemini_model.generate_content(
+        # gemini-pro has no system role, so the static prefix leads the prompt
+        if system_prompt:
+            prompt = f"{system_prompt}\n\n{prompt}"
+        async with self.rate_limiters[LLMProvider.GEMINI].limit(self._estimate_tokens(prompt, max_tokens)):
+            response = await self.gemini_model.generate_content_async(
                 prompt,
                 generation_config={
                     "temperature": 0.3,
-                    "max_output_tokens": 1000,
+                    "max_output_tokens": max_tokens,
                 }
             )
-            return response.text
-        
-        return await loop.run_in_executor(None, _make_request)
+        return response.text
     
     def _parse_explanation_response(self, response: str) -> Dict:
         """Parse explanation response from LLM"""
         try:
             # Try to extract JSON from response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                parsed = json.loads(json_str)
-                
-                # Ensure all expected fields exist with defaults
-                return {
-                    "explanation": parsed.get("explanation", "No explanation provided"),
-                    "key_phrases_detailed": parsed.get("key_phrases_detailed", []),
-                    "overall_score": parsed.get("overall_score", {"positive": 0, "negative": 0, "neutral": 0}),
-                    "tone": parsed.get("tone", "neutral"),
-                    "context": parsed.get("context", "general"),
-                    "evidence": parsed.get("evidence", "No specific evidence provided"),
-                    "dominant_factor": parsed.get("dominant_factor", "Not specified"),
-                    "reasoning": parsed.get("reasoning", "No detailed reasoning provided"),
-                    "suggestions": parsed.get("suggestions", [])
-                }
+            match = JSON_OBJECT_PATTERN.search(response)
+            if match:
+                return self._normalize_explanation(_loads(match.group(0)))
             else:
-                return json.loads(response)
+                return _loads(response)
         except json.JSONDecodeError:
             # Fallback if JSON parsing fails
             return {
@@ -332,16 +614,27 @@ Format:
                 "suggestions": []
             }
     
+    def _parse_batch_explanation_response(self, response: str, expected: int) -> List[Dict]:
+        """Parse a JSON array of explanations, raising ValueError on a count mismatch"""
+        match = JSON_ARRAY_PATTERN.search(response)
+        parsed = _loads(match.group(0) if match else response)
+        
+        if not isinstance(parsed, list) or len(parsed) != expected:
+            raise ValueError(f"Expected {expected} explanations, got {len(parsed) if isinstance(parsed, list) else 0}")
+        
+        parsed.sort(key=lambda item: item.pop("index", 0))
+        return [self._normalize_explanation(item) for item in parsed]
+    
+    @staticmethod
+    def _normalize_explanation(parsed: Dict) -> Dict:
+        """Ensure all expected explanation fields exist with defaults"""
+        return {**_explanation_defaults(), **parsed}
+    
     def _parse_insights_response(self, response: str) -> Dict:
         """Parse insights response from LLM"""
         try:
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-            else:
-                return json.loads(response)
+            match = JSON_OBJECT_PATTERN.search(response)
+            return _loads(match.group(0) if match else response)
         except json.JSONDecodeError:
             return {
                 "summary": response,
@@ -4,23 +4,51 @@ Logs inputs, outputs, latency, and errors
 """
 import logging
 import sys
+import copy
 import json
-from datetime import datetime
-from typing import Optional
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # Create logs directory
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
 
+def _json_default(obj):
+    """Serialize values the JSON encoders do not handle natively"""
+    if isinstance(obj, datetime):
+        return obj.isoformat().replace('+00:00', 'Z')
+    return str(obj)
+
+
+def dumps(data: dict) -> str:
+    """Serialize a log record to a JSON string, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        ).decode()
+    return json.dumps(data, default=_json_default)
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -37,7 +65,80 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, 'extra_data'):
             log_data.update(record.extra_data)
         
-        return json.dumps(log_data)
+        return dumps(log_data)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    Queue handler that keeps the exception separate from the message
+    so JSONFormatter can still emit it as its own field
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so exc_info can travel with the record;
+        # only merge args so later mutation cannot change the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# File writes happen on background listener threads, off the request path
+_listeners: List[QueueListener] = []
+
+
+def _queued(handler: logging.Handler) -> logging.Handler:
+    """
+    Wrap a handler so records are queued in memory and written by a listener thread
+    
+    Args:
+        handler: Handler that performs the actual (blocking) output
+    
+    Returns:
+        Queue handler to attach to loggers
+    """
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.setLevel(handler.level)
+    return queue_handler
+
+
+def _file_handler(filename: str, level: int) -> logging.Handler:
+    """Create a lazily-opened JSON file handler inside LOGS_DIR"""
+    handler = logging.FileHandler(LOGS_DIR / filename, delay=True)
+    handler.setLevel(level)
+    handler.setFormatter(JSONFormatter())
+    return handler
+
+
+@atexit.register
+def _stop_listeners():
+    """Flush queued records to disk on shutdown"""
+    for listener in _listeners:
+        listener.stop()
+    _listeners.clear()
+
+
+def _console_handler(level: int) -> logging.Handler:
+    """Create a stdout handler with standard formatting"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    return handler
+
+
+# Shared console and app.log handlers for all module loggers
+console_log_handler = _queued(_console_handler(logging.INFO))
+app_log_handler = _queued(_file_handler('app.log', logging.INFO))
+
+# Configured loggers by name, so repeat lookups skip the logging manager lock
+_logger_cache: Dict[str, logging.Logger] = {}
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -50,29 +151,19 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    if name in _logger_cache:
+        return _logger_cache[name]
+    
     logger = logging.getLogger(name)
+    _logger_cache[name] = logger
     
     # Avoid adding handlers multiple times
     if logger.handlers:
         return logger
     
     logger.setLevel(logging.INFO)
-    
-    # Console handler with standard formatting
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler with JSON formatting
-    json_handler = logging.FileHandler(LOGS_DIR / 'app.log')
-    json_handler.setLevel(logging.INFO)
-    json_handler.setFormatter(JSONFormatter())
-    
-    logger.addHandler(console_handler)
-    logger.addHandler(json_handler)
+    logger.addHandler(console_log_handler)
+    logger.addHandler(app_log_handler)
     
     return logger
 
@@ -81,8 +172,7 @@ def get_logger(name: str) -> logging.Logger:
 prediction_logger = logging.getLogger('predictions')
 prediction_logger.setLevel(logging.INFO)
 
-prediction_handler = logging.FileHandler(LOGS_DIR / 'predictions.log')
-prediction_handler.setFormatter(JSONFormatter())
+prediction_handler = _queued(_file_handler('predictions.log', logging.INFO))
 prediction_logger.addHandler(prediction_handler)
 
 
@@ -107,11 +197,12 @@ def log_prediction(
         success: Whether prediction succeeded
         error: Error message if failed
     """
+    input_length = len(input_text)
     log_data = {
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': datetime.now(timezone.utc),
         'request_id': request_id,
-        'input_text': input_text[:200] + ('...' if len(input_text) > 200 else ''),
-        'input_length': len(input_text),
+        'input_text': input_text if input_length <= 200 else input_text[:200] + '...',
+        'input_length': input_length,
         'prediction': prediction,
         'confidence': confidence,
         'latency_ms': latency_ms,
@@ -121,13 +212,12 @@ def log_prediction(
     if error:
         log_data['error'] = error
     
-    prediction_logger.info(json.dumps(log_data))
+    prediction_logger.info(dumps(log_data))
 
 
 # Error logger
 error_logger = logging.getLogger('errors')
 error_logger.setLevel(logging.ERROR)
 
-error_handler = logging.FileHandler(LOGS_DIR / 'errors.log')
-error_handler.setFormatter(JSONFormatter())
+error_handler = _queued(_file_handler('errors.log', logging.ERROR))
 error_logger.addHandler(error_handler)
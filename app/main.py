@@ -3,6 +3,7 @@ FastAPI Production Wrapper for Sentiment Analysis Model
 """
 import os
 import time
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -11,7 +12,9 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 import uvicorn
 
 # Load environment variables
@@ -20,6 +23,8 @@ load_dotenv()
 from app.model import SentimentModel
 from app.logger import get_logger, log_prediction
 from app.metrics import MetricsCollector
+from app.compression import GzipRequestMiddleware
+from app.routing import ORJSONRoute
 from app.llm_enhancer import llm_enhancer, LLMProvider
 
 # Initialize logger
@@ -36,7 +41,7 @@ async def lifespan(app: FastAPI):
     global model
     logger.info("Starting application - Loading model...")
     try:
-        model = SentimentModel()
+        model = SentimentModel(metrics=metrics)
         await model.load()
         logger.info("Model loaded successfully")
         yield
@@ -47,6 +52,7 @@ async def lifespan(app: FastAPI):
         logger.info("Shutting down application")
         if model:
             await model.unload()
+        await llm_enhancer.close()
 
 
 # Initialize FastAPI app
@@ -54,9 +60,13 @@ app = FastAPI(
     title="Sentiment Analysis API",
     description="Production-ready sentiment analysis microservice using BERT",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Parse JSON request bodies with orjson (routes below are created with this class)
+app.router.route_class = ORJSONRoute
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,6 +76,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept gzip-compressed request bodies (large batch payloads)
+app.add_middleware(GzipRequestMiddleware)
+
+# gzip responses large enough to benefit (batch results, metrics); single
+# predictions stay under the threshold and are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 
 # Request/Response Models
 class PredictionRequest(BaseModel):
@@ -76,33 +93,41 @@ class PredictionRequest(BaseModel):
     enhanced: bool = Field(False, description="Use LLM enhancement for detailed analysis")
     llm_provider: Optional[str] = Field(None, description="LLM provider: 'groq', 'gemini', or 'auto'")
     
-    @validator('text')
-    def validate_text(cls, v):
-        if not v.strip():
-            raise ValueError("Text cannot be empty or only whitespace")
-        return v.strip()
-
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "text": "This product is amazing! I love it.",
                 "return_probabilities": True,
                 "request_id": "req_123"
             }
         }
+    )
+    
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v):
+        stripped = v.strip()
+        if not stripped:
+            raise ValueError("Text cannot be empty or only whitespace")
+        return stripped
 
 
 class BatchPredictionRequest(BaseModel):
     """Request schema for batch prediction endpoint"""
-    texts: List[str] = Field(..., min_items=1, max_items=100)
+    texts: List[str] = Field(..., min_length=1, max_length=100)
     return_probabilities: bool = Field(False)
     request_id: Optional[str] = Field(None)
     enhanced: bool = Field(False, description="Use LLM enhancement for batch insights")
+    explain_items: bool = Field(
+        False,
+        description="Attach an LLM explanation to each prediction (one extra LLM call per 10 texts)"
+    )
     llm_provider: Optional[str] = Field(None, description="LLM provider: 'groq', 'gemini', or 'auto'")
     
-    @validator('texts')
+    @field_validator('texts')
+    @classmethod
     def validate_texts(cls, v):
-        cleaned = [text.strip() for text in v if text.strip()]
+        cleaned = [stripped for stripped in (text.strip() for text in v) if stripped]
         if not cleaned:
             raise ValueError("At least one non-empty text is required")
         return cleaned
@@ -130,6 +155,8 @@ class BatchPredictionResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response"""
+    model_config = ConfigDict(protected_namespaces=())
+    
     status: str
     model_loaded: bool
     version: str
@@ -138,10 +165,14 @@ class HealthResponse(BaseModel):
 
 class MetricsResponse(BaseModel):
     """Metrics response"""
+    model_config = ConfigDict(protected_namespaces=())
+    
     total_requests: int
     successful_requests: int
     failed_requests: int
     average_latency_ms: float
+    cache_hits: int = 0
+    cache_misses: int = 0
     uptime_seconds: float
     model_info: Dict[str, str]
 
@@ -194,12 +225,19 @@ async def get_metrics():
         successful_requests=stats['successful_requests'],
         failed_requests=stats['failed_requests'],
         average_latency_ms=stats['average_latency_ms'],
+        cache_hits=stats['cache_hits'],
+        cache_misses=stats['cache_misses'],
         uptime_seconds=stats['uptime_seconds'],
         model_info=model.get_info()
     )
 
 
-@app.post("/api/v1/predict", response_model=PredictionResponse, tags=["Prediction"])
+@app.post(
+    "/api/v1/predict",
+    response_model=PredictionResponse,
+    response_model_exclude_none=True,
+    tags=["Prediction"]
+)
 async def predict(request: PredictionRequest):
     """
     Predict sentiment for a single text
@@ -217,27 +255,37 @@ async def predict(request: PredictionRequest):
             detail="Model not loaded"
         )
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Log input
         logger.info(f"Prediction request received: {request.request_id or 'no_id'} (enhanced={request.enhanced})")
         
-        # Detect language and translate if enhanced mode
+        # Run prediction; in enhanced mode, predict on the original text while
+        # language detection is in flight and reuse it when no translation is needed
         language_info = None
-        text_to_analyze = request.text
         if request.enhanced:
             provider = LLMProvider(request.llm_provider) if request.llm_provider else LLMProvider.AUTO
-            language_info = await llm_enhancer.detect_language_and_translate(request.text, provider)
+            language_info, result = await asyncio.gather(
+                llm_enhancer.detect_language_and_translate(request.text, provider),
+                model.predict(
+                    text=request.text,
+                    return_probabilities=request.return_probabilities
+                )
+            )
             text_to_analyze = language_info.get('translated_text', request.text)
+            if text_to_analyze != request.text:
+                result = await model.predict(
+                    text=text_to_analyze,
+                    return_probabilities=request.return_probabilities
+                )
+        else:
+            result = await model.predict(
+                text=request.text,
+                return_probabilities=request.return_probabilities
+            )
         
-        # Run prediction
-        result = await model.predict(
-            text=text_to_analyze,
-            return_probabilities=request.return_probabilities
-        )
-        
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter() - start_time) * 1000
         
         # Get enhanced analysis if requested
         enhanced_analysis = None
@@ -278,7 +326,7 @@ async def predict(request: PredictionRequest):
         return response
         
     except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter() - start_time) * 1000
         logger.error(f"Prediction failed: {str(e)}", exc_info=True)
         
         # Log failed prediction
@@ -301,7 +349,12 @@ async def predict(request: PredictionRequest):
         )
 
 
-@app.post("/api/v1/predict/batch", response_model=BatchPredictionResponse, tags=["Prediction"])
+@app.post(
+    "/api/v1/predict/batch",
+    response_model=BatchPredictionResponse,
+    response_model_exclude_none=True,
+    tags=["Prediction"]
+)
 async def predict_batch(request: BatchPredictionRequest):
     """
     Predict sentiment for multiple texts in batch
@@ -310,6 +363,7 @@ async def predict_batch(request: BatchPredictionRequest):
     - **return_probabilities**: Whether to return class probabilities
     - **request_id**: Optional tracking ID
     - **enhanced**: Enable LLM-powered batch insights (trends, patterns, summary)
+    - **explain_items**: Also explain each prediction (batched, 10 texts per LLM call)
     - **llm_provider**: Choose LLM provider ('groq', 'gemini', or 'auto')
     """
     if not model or not model.is_loaded:
@@ -318,39 +372,61 @@ async def predict_batch(request: BatchPredictionRequest):
             detail="Model not loaded"
         )
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     predictions = []
     sentiments = []
     
     try:
         logger.info(f"Batch prediction request: {len(request.texts)} texts (enhanced={request.enhanced})")
         
-        for idx, text in enumerate(request.texts):
-            pred_start = time.time()
-            result = await model.predict(text, request.return_probabilities)
-            pred_latency = (time.time() - pred_start) * 1000
-            
+        pred_start = time.perf_counter()
+        results = await model.predict_many(request.texts, request.return_probabilities)
+        pred_latency = round((time.perf_counter() - pred_start) * 1000 / len(results), 2)
+        timestamp = datetime.utcnow().isoformat()
+        rid_prefix = request.request_id or 'batch'
+        
+        for idx, result in enumerate(results):
             predictions.append(PredictionResponse(
                 sentiment=result['sentiment'],
                 confidence=result['confidence'],
                 probabilities=result.get('probabilities'),
-                latency_ms=round(pred_latency, 2),
-                request_id=f"{request.request_id or 'batch'}_{idx}",
-                timestamp=datetime.utcnow().isoformat()
+                latency_ms=pred_latency,
+                request_id=f"{rid_prefix}_{idx}",
+                timestamp=timestamp
             ))
             sentiments.append(result['sentiment'])
         
-        total_latency = (time.time() - start_time) * 1000
+        total_latency = (time.perf_counter() - start_time) * 1000
         
-        # Get batch insights if enhanced mode
+        # Get batch insights if enhanced mode; per-item explanations cost extra
+        # LLM calls, so they are only added when asked for
         batch_insights = None
-        if request.enhanced:
+        explanations = None
+        if request.enhanced or request.explain_items:
             provider = LLMProvider(request.llm_provider) if request.llm_provider else LLMProvider.AUTO
-            batch_insights = await llm_enhancer.analyze_batch_insights(
-                texts=request.texts,
-                sentiments=sentiments,
-                provider=provider
-            )
+            tasks = []
+            if request.enhanced:
+                tasks.append(llm_enhancer.analyze_batch_insights(
+                    texts=request.texts,
+                    sentiments=sentiments,
+                    provider=provider
+                ))
+            if request.explain_items:
+                items = [
+                    {"text": text, "sentiment": pred.sentiment, "confidence": pred.confidence}
+                    for text, pred in zip(request.texts, predictions)
+                ]
+                tasks.append(llm_enhancer.explain_sentiments_batch(items, provider))
+            
+            results = await asyncio.gather(*tasks)
+            if request.enhanced:
+                batch_insights = results[0]
+            if request.explain_items:
+                explanations = results[-1]
+        
+        if explanations is not None:
+            for prediction, explanation in zip(predictions, explanations):
+                prediction.enhanced_analysis = explanation
         
         metrics.record_request(total_latency, success=True)
         
@@ -364,7 +440,7 @@ async def predict_batch(request: BatchPredictionRequest):
         )
         
     except Exception as e:
-        total_latency = (time.time() - start_time) * 1000
+        total_latency = (time.perf_counter() - start_time) * 1000
         logger.error(f"Batch prediction failed: {str(e)}", exc_info=True)
         metrics.record_request(total_latency, success=False)
         
@@ -375,10 +451,19 @@ async def predict_batch(request: BatchPredictionRequest):
 
 
 if __name__ == "__main__":
+    # Each worker process loads its own copy of the model, so memory scales
+    # with WEB_CONCURRENCY, and keeps its own metrics, so /metrics only covers
+    # the worker that answers it. One worker by default; reload mode forces one
+    dev_reload = os.getenv("DEV_RELOAD") == "1"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # Listen on a Unix domain socket instead of TCP for same-host clients
+        uds=os.getenv("UVICORN_UDS") or None,
+        reload=dev_reload,
+        workers=1 if dev_reload else int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -3,8 +3,39 @@ Metrics collection for monitoring service performance
 """
 import time
 from dataclasses import dataclass, field
+from threading import Lock, local
 from typing import List
-from threading import Lock
+
+import numpy as np
+
+# Number of most recent latencies kept for the latency statistics (per thread)
+MAX_LATENCY_SAMPLES = 1000
+
+
+@dataclass
+class _MetricsShard:
+    """Counters and latency ring buffer written by a single thread"""
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # Preallocated ring buffer of recent latencies; idx is the next write slot
+    buf: np.ndarray = field(default_factory=lambda: np.zeros(MAX_LATENCY_SAMPLES, dtype=np.float32))
+    idx: int = 0
+    count: int = 0
+    # Running sum of the latencies currently in buf, so the average needs no pass over it
+    latency_sum: float = 0.0
+    
+    def clear(self):
+        self.total_requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.idx = 0
+        self.count = 0
+        self.latency_sum = 0.0
 
 
 @dataclass
@@ -12,13 +43,53 @@ class MetricsCollector:
     """
     Thread-safe metrics collector
     Tracks requests, latencies, and errors
+    
+    Each recording thread writes to its own shard without locking; shards
+    are only summed when stats are read.
     """
-    total_requests: int = 0
-    successful_requests: int = 0
-    failed_requests: int = 0
-    latencies: List[float] = field(default_factory=list)
     start_time: float = field(default_factory=time.time)
     _lock: Lock = field(default_factory=Lock)
+    _local: local = field(default_factory=local)
+    _shards: List[_MetricsShard] = field(default_factory=list)
+    
+    def _shard(self) -> _MetricsShard:
+        """Return the calling thread's shard, registering it on first use"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _MetricsShard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+    
+    def _total(self, name: str) -> int:
+        return sum(getattr(shard, name) for shard in self._shards)
+    
+    @property
+    def total_requests(self) -> int:
+        return self._total("total_requests")
+    
+    @property
+    def successful_requests(self) -> int:
+        return self._total("successful_requests")
+    
+    @property
+    def failed_requests(self) -> int:
+        return self._total("failed_requests")
+    
+    @property
+    def cache_hits(self) -> int:
+        return self._total("cache_hits")
+    
+    @property
+    def cache_misses(self) -> int:
+        return self._total("cache_misses")
+    
+    @property
+    def latencies(self) -> np.ndarray:
+        """Recorded latencies in the window (unordered once a buffer wraps)"""
+        views = [shard.buf[:shard.count] for shard in self._shards]
+        return np.concatenate(views) if views else np.zeros(0, dtype=np.float32)
     
     def record_request(self, latency_ms: float, success: bool = True):
         """
@@ -28,18 +99,33 @@ class MetricsCollector:
             latency_ms: Request processing time in milliseconds
             success: Whether the request was successful
         """
-        with self._lock:
-            self.total_requests += 1
-            if success:
-                self.successful_requests += 1
-            else:
-                self.failed_requests += 1
-            
-            self.latencies.append(latency_ms)
-            
-            # Keep only last 1000 latencies to avoid memory growth
-            if len(self.latencies) > 1000:
-                self.latencies = self.latencies[-1000:]
+        shard = self._shard()
+        shard.total_requests += 1
+        if success:
+            shard.successful_requests += 1
+        else:
+            shard.failed_requests += 1
+        
+        # Overwrite the oldest slot once the buffer is full
+        if shard.count == MAX_LATENCY_SAMPLES:
+            shard.latency_sum -= float(shard.buf[shard.idx])
+        shard.buf[shard.idx] = latency_ms
+        shard.latency_sum += float(shard.buf[shard.idx])
+        shard.idx = (shard.idx + 1) % MAX_LATENCY_SAMPLES
+        shard.count = min(shard.count + 1, MAX_LATENCY_SAMPLES)
+    
+    def record_cache_lookup(self, hit: bool):
+        """
+        Record a prediction cache lookup
+        
+        Args:
+            hit: Whether the prediction was served from the cache
+        """
+        shard = self._shard()
+        if hit:
+            shard.cache_hits += 1
+        else:
+            shard.cache_misses += 1
     
     def get_stats(self) -> dict:
         """
@@ -49,30 +135,38 @@ class MetricsCollector:
             Dictionary with current metrics
         """
         with self._lock:
-            avg_latency = (
-                sum(self.latencies) / len(self.latencies)
-                if self.latencies else 0.0
-            )
+            total_requests = self.total_requests
+            successful_requests = self.successful_requests
+            # Reduce each shard's window in place rather than concatenating them
+            windows = [shard.buf[:shard.count] for shard in self._shards if shard.count]
+            samples = sum(window.size for window in windows)
+            
+            if samples:
+                avg_latency = sum(shard.latency_sum for shard in self._shards) / samples
+                min_latency = min(float(window.min()) for window in windows)
+                max_latency = max(float(window.max()) for window in windows)
+            else:
+                avg_latency = min_latency = max_latency = 0.0
             
             return {
-                'total_requests': self.total_requests,
-                'successful_requests': self.successful_requests,
+                'total_requests': total_requests,
+                'successful_requests': successful_requests,
                 'failed_requests': self.failed_requests,
                 'success_rate': (
-                    self.successful_requests / self.total_requests * 100
-                    if self.total_requests > 0 else 0.0
+                    successful_requests / total_requests * 100
+                    if total_requests > 0 else 0.0
                 ),
                 'average_latency_ms': round(avg_latency, 2),
-                'min_latency_ms': round(min(self.latencies), 2) if self.latencies else 0.0,
-                'max_latency_ms': round(max(self.latencies), 2) if self.latencies else 0.0,
+                'min_latency_ms': round(min_latency, 2),
+                'max_latency_ms': round(max_latency, 2),
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
                 'uptime_seconds': round(time.time() - self.start_time, 2)
             }
     
     def reset(self):
         """Reset all metrics"""
         with self._lock:
-            self.total_requests = 0
-            self.successful_requests = 0
-            self.failed_requests = 0
-            self.latencies = []
+            for shard in self._shards:
+                shard.clear()
             self.start_time = time.time()
@@ -2,7 +2,40 @@
 Test/Demo mode for LLM Enhancement
 Provides simulated responses when API keys are not available or for testing
 """
-from typing import Dict, List
+import re
+from typing import Dict, List, Tuple
+
+# Character ranges used by the language heuristic, checked in this priority order
+SCRIPT_PATTERNS = (
+    ("zh", re.compile("[\u4e00-\u9fff]")),
+    ("ar", re.compile("[\u0600-\u06ff]")),
+    ("ru", re.compile("[\u0400-\u04ff]")),
+)
+NON_LATIN_PATTERN = re.compile("[\u0400-\u04ff\u0600-\u06ff\u4e00-\u9fff]")
+
+# Lowercase phrase tables, built once at import
+POSITIVE_PHRASES = ("amazing", "love it", "excellent", "great", "wonderful", "fantastic")
+NEGATIVE_PHRASES = ("terrible", "worst", "awful", "disappointed", "waste", "horrible", "poor")
+NEGATIVE_SUGGESTIONS = (
+    "Consider addressing the specific pain points mentioned",
+    "Implement quality control measures to prevent similar issues",
+    "Improve customer support response time",
+)
+
+
+def _phrase_pattern(phrases: Tuple[str, ...]) -> "re.Pattern":
+    """Compile a phrase list into one alternation, longest phrases first"""
+    return re.compile("|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True)))
+
+
+POSITIVE_PATTERN = _phrase_pattern(POSITIVE_PHRASES)
+NEGATIVE_PATTERN = _phrase_pattern(NEGATIVE_PHRASES)
+
+
+def _match_phrases(text: str, phrases: Tuple[str, ...], pattern: "re.Pattern") -> List[str]:
+    """Return up to five phrases found in text, in phrase-list order"""
+    found = set(pattern.findall(text.lower()))
+    return [phrase for phrase in phrases if phrase in found][:5]
 
 
 class MockLLMEnhancer:
@@ -14,28 +47,16 @@ class MockLLMEnhancer:
         if sentiment == "positive":
             return {
                 "explanation": f"The text expresses strong positive sentiment with {confidence:.1%} confidence. Words like 'amazing', 'love', 'great', and 'excellent' indicate enthusiasm and satisfaction.",
-                "key_phrases": [
-                    phrase for phrase in ["amazing", "love it", "excellent", "great", "wonderful", "fantastic"]
-                    if phrase.lower() in text.lower()
-                ][:5] or ["positive language", "enthusiastic tone"],
+                "key_phrases": _match_phrases(text, POSITIVE_PHRASES, POSITIVE_PATTERN) or ["positive language", "enthusiastic tone"],
                 "reasoning": "The text uses superlative language and emotional expressions that clearly indicate a positive experience. The strong conviction in the wording (e.g., 'absolutely', 'so much') reinforces the positive sentiment.",
                 "suggestions": []
             }
         else:  # negative
-            suggestions = [
-                "Consider addressing the specific pain points mentioned",
-                "Implement quality control measures to prevent similar issues",
-                "Improve customer support response time",
-                "Offer solutions or compensation for negative experiences"
-            ]
             return {
                 "explanation": f"The text expresses strong negative sentiment with {confidence:.1%} confidence. Words like 'terrible', 'worst', 'awful', and 'disappointed' indicate dissatisfaction and frustration.",
-                "key_phrases": [
-                    phrase for phrase in ["terrible", "worst", "awful", "disappointed", "waste", "horrible", "poor"]
-                    if phrase.lower() in text.lower()
-                ][:5] or ["negative language", "critical tone"],
+                "key_phrases": _match_phrases(text, NEGATIVE_PHRASES, NEGATIVE_PATTERN) or ["negative language", "critical tone"],
                 "reasoning": "The text contains strong negative indicators and critical language. The intensity of the criticism (e.g., 'worst ever', 'complete waste') suggests a deeply negative experience.",
-                "suggestions": suggestions[:3]
+                "suggestions": list(NEGATIVE_SUGGESTIONS)
             }
     
     @staticmethod
@@ -82,35 +103,24 @@ class MockLLMEnhancer:
     @staticmethod
     def detect_language(text: str) -> Dict:
         """Mock language detection"""
-        # Simple heuristic - check for common non-English characters
-        has_chinese = any('\u4e00' <= char <= '\u9fff' for char in text)
-        has_arabic = any('\u0600' <= char <= '\u06ff' for char in text)
-        has_cyrillic = any('\u0400' <= char <= '\u04ff' for char in text)
+        # Simple heuristic - check for common non-English characters.
+        # One scan finds the first non-Latin character; plain English text
+        # (the common case) never needs the per-script checks.
+        first = NON_LATIN_PATTERN.search(text)
+        if first is not None:
+            for language, pattern in SCRIPT_PATTERNS:
+                if pattern.search(text, first.start()):
+                    return {
+                        "language": language,
+                        "is_english": False,
+                        "translated_text": text  # Would translate in real implementation
+                    }
         
-        if has_chinese:
-            return {
-                "language": "zh",
-                "is_english": False,
-                "translated_text": text  # Would translate in real implementation
-            }
-        elif has_arabic:
-            return {
-                "language": "ar",
-                "is_english": False,
-                "translated_text": text
-            }
-        elif has_cyrillic:
-            return {
-                "language": "ru",
-                "is_english": False,
-                "translated_text": text
-            }
-        else:
-            return {
-                "language": "en",
-                "is_english": True,
-                "translated_text": text
-            }
+        return {
+            "language": "en",
+            "is_english": True,
+            "translated_text": text
+        }
 
 
 # Global mock instance
@@ -1,31 +1,95 @@
 """
-Sentiment Analysis Model - Synchronous Version for macOS
+Sentiment Analysis Model with dynamic micro-batching
 """
+import os
+import shutil
+import asyncio
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import torch
-from transformers import pipeline
+from transformers import pipeline, AutoTokenizer
 import logging
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+try:
+    from optimum.bettertransformer import BetterTransformer
+    BETTER_TRANSFORMER_AVAILABLE = True
+except ImportError:
+    BETTER_TRANSFORMER_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from app.metrics import MetricsCollector
+
+# Where exported int8 ONNX models are cached between restarts (one
+# subdirectory per model name)
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "models/onnx-int8")
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+# Weight dtype for the PyTorch model (e.g. float16 to halve memory traffic);
+# the ONNX model is always int8
+MODEL_DTYPE = os.getenv("MODEL_DTYPE", "float32")
+
+# Threads running model inference off the event loop
+INFER_WORKERS = int(os.getenv("INFER_WORKERS", "2"))
+
+# Compute threads for the model in this process. Each uvicorn worker loads its
+# own model, so by default the cores are split evenly between workers instead
+# of every worker's thread pool spanning all of them
+INFER_THREADS = int(
+    os.getenv("INFER_THREADS")
+    or max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("WEB_CONCURRENCY") or "1")))
+)
+
+# Raw predictions kept for repeated texts (0 disables the cache)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+
+# Concurrent predict() calls are grouped into one forward pass of up to
+# MAX_BATCH_SIZE texts, waiting at most BATCH_TIMEOUT_S for the batch to fill
+MAX_BATCH_SIZE = 16
+BATCH_TIMEOUT_S = 0.005
+
+# Largest chunk the pipeline feeds through the model at once for predict_many
+MAX_PIPELINE_BATCH_SIZE = 32
+
 
 class SentimentModel:
-    def __init__(self, model_name: str = "distilbert-base-uncased-finetuned-sst-2-english"):
+    def __init__(
+        self,
+        model_name: str = "distilbert-base-uncased-finetuned-sst-2-english",
+        metrics: Optional["MetricsCollector"] = None
+    ):
         self.model_name = model_name
+        self.metrics = metrics
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
         self.pipeline = None
         self.is_loaded = False
-        try:
-            torch.set_num_threads(1)
-            torch.set_num_interop_threads(1)
-        except RuntimeError:
-            # Already set, ignore error in tests
-            pass
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.use_onnx = ONNX_AVAILABLE and os.getenv("USE_ONNX", "true").lower() == "true"
     
     async def load(self):
-        """Load model"""
+        """Load model and start the batching worker"""
         try:
             logger.info(f"Loading model: {self.model_name}")
             self._load_model()
+            self._executor = ThreadPoolExecutor(
+                max_workers=INFER_WORKERS,
+                thread_name_prefix="inference"
+            )
+            self._queue = asyncio.Queue()
+            self._batcher_task = asyncio.create_task(self._batch_loop())
             self.is_loaded = True
             logger.info("Model loaded successfully")
         except Exception as e:
@@ -34,40 +98,254 @@ class SentimentModel:
     
     def _load_model(self):
         """Load model synchronously"""
+        # Also bounds the tokenizer-side torch ops on the ONNX path
+        torch.set_num_threads(INFER_THREADS)
+        
+        if self.use_onnx:
+            try:
+                self.pipeline = pipeline(
+                    "sentiment-analysis",
+                    model=self._load_onnx_model(),
+                    tokenizer=AutoTokenizer.from_pretrained(self.model_name)
+                )
+                return
+            except Exception as e:
+                logger.warning(f"ONNX Runtime load failed, falling back to PyTorch: {str(e)}")
+                self.use_onnx = False
+        
         self.pipeline = pipeline(
             "sentiment-analysis",
             model=self.model_name,
-            device=-1
+            device=-1,
+            torch_dtype=getattr(torch, MODEL_DTYPE)
         )
+        
+        # Swap in fused attention kernels for the PyTorch forward pass
+        if BETTER_TRANSFORMER_AVAILABLE:
+            try:
+                self.pipeline.model = BetterTransformer.transform(
+                    self.pipeline.model,
+                    keep_original_model=False
+                )
+            except Exception as e:
+                logger.warning(f"BetterTransformer not applied: {str(e)}")
+    
+    def _load_onnx_model(self):
+        """
+        Load the int8 ONNX model, exporting and quantizing it on first run
+        
+        Returns:
+            ORTModelForSequenceClassification on the CPU execution provider
+        """
+        model_dir = os.path.join(ONNX_MODEL_DIR, self.model_name.replace("/", "--"))
+        if not os.path.isfile(os.path.join(model_dir, ONNX_MODEL_FILE)):
+            self._export_onnx_model(model_dir)
+        
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = INFER_THREADS
+        return ORTModelForSequenceClassification.from_pretrained(
+            model_dir,
+            file_name=ONNX_MODEL_FILE,
+            provider="CPUExecutionProvider",
+            session_options=session_options
+        )
+    
+    def _export_onnx_model(self, model_dir: str):
+        """
+        Export and quantize the model into model_dir
+        
+        The export is written to a temporary directory and renamed into place,
+        so concurrent workers never read a half-written model and a crash
+        mid-export leaves nothing behind.
+        
+        Args:
+            model_dir: Final directory for the quantized model
+        """
+        logger.info(f"Exporting {self.model_name} to int8 ONNX in {model_dir}")
+        os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=ONNX_MODEL_DIR, prefix=".export-")
+        try:
+            ort_model = ORTModelForSequenceClassification.from_pretrained(
+                self.model_name,
+                export=True,
+                provider="CPUExecutionProvider"
+            )
+            quantizer = ORTQuantizer.from_pretrained(ort_model)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+            
+            # Another worker may have finished first; its export is just as good
+            if os.path.isfile(os.path.join(model_dir, ONNX_MODEL_FILE)):
+                return
+            # Clear out an incomplete directory left by an older crashed export
+            shutil.rmtree(model_dir, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, model_dir)
+            except OSError:
+                if not os.path.isfile(os.path.join(model_dir, ONNX_MODEL_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
     
     async def predict(self, text: str, return_probabilities: bool = False) -> Dict:
-        """Make prediction synchronously"""
+        """Queue text for the next micro-batch and wait for its prediction"""
         if not self.is_loaded:
             raise RuntimeError("Model not loaded. Call load() first.")
         
-        # Run directly without executor
-        results = self.pipeline(text, top_k=2)
-        result = results[0]
+        result = self._cache_get(text)
+        if result is None:
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((text, future))
+            result = await future
+            self._cache_set(text, result)
         
-        sentiment = "positive" if result['label'] == 'POSITIVE' else "negative"
-        confidence = result['score']  # Keep as 0-1 range
+        return self._format_result(result, return_probabilities)
+    
+    async def predict_many(self, texts: List[str], return_probabilities: bool = False) -> List[Dict]:
+        """
+        Predict sentiment for a list of texts in a single pipeline call
+        
+        Args:
+            texts: Texts to analyze
+            return_probabilities: Whether to include class probabilities
+        
+        Returns:
+            One prediction dict per input text, in order
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        
+        results = [self._cache_get(text) for text in texts]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if missing:
+            loop = asyncio.get_running_loop()
+            computed = await loop.run_in_executor(
+                self._executor, self._run_pipeline, [texts[i] for i in missing]
+            )
+            for i, result in zip(missing, computed):
+                results[i] = result
+                self._cache_set(texts[i], result)
+        
+        return [self._format_result(result, return_probabilities) for result in results]
+    
+    def _cache_get(self, text: str) -> Optional[Dict]:
+        """Look up a raw prediction for text, recording the hit or miss"""
+        if PREDICTION_CACHE_SIZE <= 0:
+            return None
+        
+        result = self._cache.get(text)
+        if result is not None:
+            self._cache.move_to_end(text)
+        if self.metrics is not None:
+            self.metrics.record_cache_lookup(hit=result is not None)
+        return result
+    
+    def _cache_set(self, text: str, result: Dict):
+        """Store a raw prediction, evicting the least recently used entry if full"""
+        if PREDICTION_CACHE_SIZE <= 0:
+            return
+        
+        self._cache[text] = result
+        self._cache.move_to_end(text)
+        if len(self._cache) > PREDICTION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    async def _batch_loop(self):
+        """Collect queued texts into micro-batches and run them through the pipeline"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + BATCH_TIMEOUT_S
+            
+            while len(batch) < MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self._run_pipeline, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    def _run_pipeline(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Run one batched forward pass, returning both class scores per text"""
+        # Each pipeline chunk is padded to its longest text, so when the input
+        # spans several chunks, group similar lengths together and restore the
+        # caller's order afterwards
+        order = list(range(len(texts)))
+        if len(texts) > MAX_PIPELINE_BATCH_SIZE:
+            order.sort(key=lambda i: len(texts[i]))
+        
+        with torch.inference_mode():
+            results = self.pipeline(
+                [texts[i] for i in order],
+                batch_size=min(MAX_PIPELINE_BATCH_SIZE, len(texts)),
+                top_k=None,
+                function_to_apply="softmax",
+                truncation=True
+            )
+        
+        scores_by_text = [None] * len(texts)
+        for i, scores in zip(order, results):
+            scores_by_text[i] = {score['label']: score['score'] for score in scores}
+        return scores_by_text
+    
+    @staticmethod
+    def _format_result(scores: Dict[str, float], return_probabilities: bool) -> Dict:
+        """Convert raw POSITIVE/NEGATIVE scores into the API response shape"""
+        pos_score = scores['POSITIVE']
+        neg_score = scores['NEGATIVE']
+        is_positive = pos_score >= neg_score
         
         response = {
-            "sentiment": sentiment,
-            "confidence": round(confidence, 4)  # 0-1 range, not percentage
+            "sentiment": "positive" if is_positive else "negative",
+            "confidence": round(pos_score if is_positive else neg_score, 4)  # 0-1 range, not percentage
         }
         
         if return_probabilities:
-            pos_score = confidence if sentiment == "positive" else (1 - confidence)
             response["probabilities"] = {
                 "positive": round(pos_score, 4),
-                "negative": round((1 - pos_score), 4)
+                "negative": round(neg_score, 4)
             }
         
         return response
     
     async def unload(self):
-        """Unload model"""
+        """Stop the batching worker and unload model"""
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            try:
+                await self._batcher_task
+            except asyncio.CancelledError:
+                pass
+            self._batcher_task = None
+        
+        # Fail anything still waiting so callers are not left hanging
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Model unloaded"))
+        self._queue = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        self._cache.clear()
         self.pipeline = None
         self.is_loaded = False
     
@@ -77,5 +355,5 @@ class SentimentModel:
             "model_name": self.model_name,
             "device": "cpu",
             "status": "loaded" if self.is_loaded else "not loaded",
-            "framework": "PyTorch + Transformers"
+            "framework": "ONNX Runtime (int8) + Transformers" if self.use_onnx else "PyTorch + Transformers"
         }
@@ -0,0 +1,100 @@
+"""
+Client-side rate limiting for LLM providers
+Gates requests on per-minute request/token quotas so calls are not wasted on 429s
+"""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate
+    Waiters sleep until enough tokens have accumulated
+    """
+    
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.refill_per_second
+        )
+        self._updated = now
+    
+    async def acquire(self, amount: float = 1.0):
+        """
+        Wait until amount tokens are available and consume them
+        
+        Args:
+            amount: Tokens to consume (clamped to the bucket capacity)
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.refill_per_second)
+
+
+class ProviderRateLimiter:
+    """
+    Request and token quotas for one provider, plus AIMD concurrency control
+    Concurrency is halved on a rate-limit error and restored additively on success
+    """
+    
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int = 8):
+        self.requests = AsyncTokenBucket(rpm, rpm / 60)
+        self.tokens = AsyncTokenBucket(tpm, tpm / 60)
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+    
+    @asynccontextmanager
+    async def limit(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """
+        Hold a request slot for the duration of a provider call
+        
+        Args:
+            estimated_tokens: Prompt plus completion token estimate
+        """
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+        
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.concurrency))
+            self._in_flight += 1
+        
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.concurrency = max(1.0, self.concurrency / 2)
+            raise
+        else:
+            self.concurrency = min(
+                float(self.max_concurrency),
+                self.concurrency + 1 / self.concurrency
+            )
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether a provider SDK exception is an HTTP 429 / quota error"""
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    name = type(error).__name__
+    return "RateLimit" in name or "ResourceExhausted" in name
@@ -0,0 +1,30 @@
+"""
+Route class that decodes JSON request bodies with orjson
+FastAPI otherwise parses them with the stdlib json module before validation
+"""
+import orjson
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """Request whose json() is parsed by orjson"""
+    
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI
+            # still turns malformed bodies into a 422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that hands its endpoint an ORJSONRequest"""
+    
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request):
+            return await handler(ORJSONRequest(request.scope, request.receive))
+        
+        return route_handler
@@ -3,37 +3,186 @@
 CLI tool for testing the sentiment analysis API
 """
 import argparse
+import os
 import sys
-import json
-import requests
-from typing import Optional
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import print as rprint
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 
+# Third-party modules are imported inside the functions that use them,
+# so `--help` and argument errors return without loading httpx or rich
+if TYPE_CHECKING:
+    import asyncio
+    import httpx
+    from rich.console import Console
+    from rich.text import Text
 
-console = Console()
+HTTP_HEADERS = {'Accept-Encoding': 'gzip', 'Content-Type': 'application/json'}
+
+# Batch input files up to this size are read whole; larger ones are mmapped,
+# so memory stays bounded by the chunk size rather than the file size
+READ_WHOLE_MAX_BYTES = 1024 * 1024
+
+# Batches larger than this format their number columns with NumPy
+VECTORIZE_MIN_ROWS = 500
+
+# Batch bodies above this size are gzip-compressed when --gzip is set
+GZIP_MIN_BYTES = 4096
+
+# Most texts the server accepts in one batch request
+MAX_BATCH_TEXTS = 100
+
+
+@cache
+def _stdout_is_tty() -> bool:
+    """Whether output goes to a terminal (pipes and files get plain text)"""
+    return sys.stdout.isatty()
+
+
+@cache
+def _get_console() -> "Console":
+    """Create the shared Rich console on first use"""
+    from rich.console import Console
+    if not _stdout_is_tty():
+        return Console(no_color=True, highlight=False)
+    return Console()
+
+
+@cache
+def _json_codec():
+    """Return (dumps, loads) functions, using orjson when installed"""
+    try:
+        import orjson
+        return orjson.dumps, orjson.loads
+    except ImportError:
+        import json
+        return (lambda data: json.dumps(data).encode()), json.loads
+
+
+def _dumps(data) -> bytes:
+    return _json_codec()[0](data)
+
+
+def _loads(data):
+    return _json_codec()[1](data)
+
+
+def _parse(response: "httpx.Response"):
+    """Decode a JSON response body straight from bytes (skips httpx's str decode)"""
+    return _loads(response.content)
+
+
+@cache
+def _http_settings() -> Tuple[bool, "httpx.Limits"]:
+    """
+    Shared connection settings for the sync and async clients
+    
+    Returns:
+        Whether HTTP/2 is available (h2 installed) and the connection pool limits
+    """
+    import httpx
+    try:
+        import h2  # noqa: F401 - enables HTTP/2 in httpx
+        http2 = True
+    except ImportError:
+        http2 = False
+    return http2, httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+def _split_unix_url(url: str) -> Tuple[str, Optional[str]]:
+    """
+    Resolve a unix:///path/to.sock URL into an HTTP base URL and socket path
+    
+    Returns:
+        Base URL for requests and the Unix socket path, or None for TCP URLs
+    """
+    if url.startswith('unix://'):
+        return 'http://localhost', url[len('unix://'):]
+    return url.rstrip('/'), None
 
 
 class SentimentClient:
     """Client for interacting with the sentiment API"""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
-        self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        cache_size: int = 10_000,
+        gzip_requests: bool = False
+    ):
+        # unix:// URLs talk to a same-host server over a Unix domain socket
+        self.base_url, self.uds = _split_unix_url(base_url)
+        self.gzip_requests = gzip_requests
+        # LRU of prediction results keyed by (text, return_probabilities); 0 disables
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, bool], dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Keep-alive pool shared by all calls, multiplexed over HTTP/2 when
+        # h2 is installed; connection failures are retried by the transport
+        import httpx
+        http2, limits = _http_settings()
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            headers=HTTP_HEADERS,
+            timeout=30.0,
+            transport=httpx.HTTPTransport(
+                http2=http2,
+                limits=limits,
+                retries=2,
+                uds=self.uds
+            )
+        )
+    
+    def _cache_get(self, text: str, return_probabilities: bool) -> Optional[dict]:
+        """Return a cached prediction, marking it most recently used"""
+        key = (text, return_probabilities)
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+        return result
+    
+    def _cache_set(self, text: str, return_probabilities: bool, result: dict):
+        """Store a prediction, evicting the least recently used entry if full"""
+        if self.cache_size <= 0 or 'error' in result:
+            return
+        key = (text, return_probabilities)
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _split_cached(self, texts: List[str], return_probabilities: bool) -> Tuple[Dict[str, dict], List[str]]:
+        """
+        Split texts into cached predictions and unique texts still to send
+        
+        Returns:
+            Mapping of text to cached prediction, and deduplicated cache misses
+        """
+        found = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            result = self._cache_get(text, return_probabilities)
+            if result is None:
+                missing.append(text)
+            else:
+                found[text] = result
+        return found, missing
     
     def health_check(self) -> dict:
         """Check API health"""
-        response = self.session.get(f"{self.base_url}/health")
+        response = self.client.get("/health")
         response.raise_for_status()
-        return response.json()
+        return _parse(response)
     
     def get_metrics(self) -> dict:
         """Get API metrics"""
-        response = self.session.get(f"{self.base_url}/metrics")
+        response = self.client.get("/metrics")
         response.raise_for_status()
-        return response.json()
+        return _parse(response)
     
     def predict(
         self, 
@@ -42,6 +191,12 @@ class SentimentClient:
         request_id: Optional[str] = None
     ) -> dict:
         """Predict sentiment for text"""
+        # Responses carrying a caller-supplied request ID are never reused
+        if not request_id:
+            cached = self._cache_get(text, return_probabilities)
+            if cached is not None:
+                return cached
+        
         payload = {
             "text": text,
             "return_probabilities": return_probabilities
@@ -49,35 +204,295 @@ class SentimentClient:
         if request_id:
             payload["request_id"] = request_id
         
-        response = self.session.post(
-            f"{self.base_url}/api/v1/predict",
-            json=payload
-        )
+        response = self.client.post("/api/v1/predict", content=_dumps(payload))
         response.raise_for_status()
-        return response.json()
+        result = _parse(response)
+        if not request_id:
+            self._cache_set(text, return_probabilities, result)
+        return result
     
     def predict_batch(
         self, 
         texts: list, 
         return_probabilities: bool = False
     ) -> dict:
-        """Predict sentiment for multiple texts"""
+        """
+        Predict sentiment for multiple texts, sending only unique uncached texts
+        
+        Texts that are empty once stripped get an 'error' entry instead of a
+        prediction, since the server drops them from the batch.
+        """
+        # Apply the server's strip-and-drop rule here, so the returned
+        # predictions line up with the texts that were actually sent
+        keys = [text.strip() for text in texts]
+        by_text, missing = self._split_cached([key for key in keys if key], return_probabilities)
+        result = {"predictions": [], "total_latency_ms": 0.0}
+        
+        if missing:
+            payload = {
+                "texts": missing,
+                "return_probabilities": return_probabilities
+            }
+            
+            body = _dumps(payload)
+            headers = None
+            if self.gzip_requests and len(body) > GZIP_MIN_BYTES:
+                import gzip
+                body = gzip.compress(body, compresslevel=1)
+                headers = {'Content-Encoding': 'gzip'}
+            
+            response = self.client.post("/api/v1/predict/batch", content=body, headers=headers)
+            response.raise_for_status()
+            result = _parse(response)
+            for text, pred in zip(missing, result['predictions']):
+                by_text[text] = pred
+                self._cache_set(text, return_probabilities, pred)
+        
+        result['predictions'] = [by_text[key] if key else {"error": "Empty text"} for key in keys]
+        return result
+    
+    async def _apredict(
+        self,
+        client: "httpx.AsyncClient",
+        text: str,
+        return_probabilities: bool,
+        sem: "asyncio.Semaphore"
+    ) -> dict:
+        """Send one prediction request, holding a concurrency slot"""
         payload = {
-            "texts": texts,
+            "text": text,
             "return_probabilities": return_probabilities
         }
+        async with sem:
+            response = await client.post("/api/v1/predict", content=_dumps(payload))
+        response.raise_for_status()
+        return _parse(response)
+    
+    def async_client(self) -> "httpx.AsyncClient":
+        """Create an async client with the same connection settings"""
+        import httpx
+        http2, limits = _http_settings()
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=HTTP_HEADERS,
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(
+                http2=http2,
+                limits=limits,
+                uds=self.uds
+            )
+        )
+    
+    async def predict_batch_async(
+        self,
+        texts: List[str],
+        return_probabilities: bool = False,
+        concurrency: int = 32,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> dict:
+        """
+        Predict sentiment for multiple texts with concurrent single requests
+        
+        Args:
+            texts: Texts to analyze
+            return_probabilities: Whether to return class probabilities
+            concurrency: Maximum number of requests in flight
+            client: Async client to reuse across calls (one is created if omitted)
         
-        response = self.session.post(
-            f"{self.base_url}/api/v1/predict/batch",
-            json=payload
+        Returns:
+            Batch-shaped result; failed items hold an 'error' key
+        """
+        if client is None:
+            async with self.async_client() as client:
+                return await self.predict_batch_async(texts, return_probabilities, concurrency, client)
+        
+        import asyncio
+        
+        start = time.perf_counter()
+        by_text, missing = self._split_cached(texts, return_probabilities)
+        sem = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(
+            *[self._apredict(client, text, return_probabilities, sem) for text in missing],
+            return_exceptions=True
         )
-        response.raise_for_status()
-        return response.json()
+        
+        for text, result in zip(missing, results):
+            by_text[text] = {"error": str(result)} if isinstance(result, Exception) else result
+            self._cache_set(text, return_probabilities, by_text[text])
+        
+        return {
+            "predictions": [by_text[text] for text in texts],
+            "total_latency_ms": (time.perf_counter() - start) * 1000
+        }
+
+
+def _make_client(args) -> SentimentClient:
+    """Build a client from the global CLI options"""
+    return SentimentClient(
+        args.url,
+        cache_size=0 if args.no_cache else 10_000,
+        gzip_requests=args.gzip
+    )
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    """
+    Yield the lines of a UTF-8 file without their line endings
+    
+    Files up to READ_WHOLE_MAX_BYTES are read in one call and split in C;
+    larger files are memory-mapped and read line by line. Both paths split
+    on line feeds only (str.splitlines would also break on form feeds,
+    vertical tabs and Unicode separators), so a file yields the same texts
+    whatever its size.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        # mmap cannot map an empty file
+        if size == 0:
+            return
+        
+        if size <= READ_WHOLE_MAX_BYTES:
+            yield from f.read().decode('utf-8', 'ignore').split('\n')
+            return
+        
+        import mmap
+        
+        # Lines are sliced from the memory-mapped file and decoded one at a
+        # time, so pages are read on demand and nothing is buffered twice
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b''):
+                yield raw.decode('utf-8', 'ignore')
+
+
+def _chunks(path: str, size: int, preprocess: bool = False) -> Iterator[List[str]]:
+    """
+    Stream non-empty, stripped lines from a file in lists of up to size
+    
+    Args:
+        path: File with one text per line
+        size: Maximum number of texts per chunk
+        preprocess: Normalize each line with preprocess.normalize first
+    
+    Yields:
+        Lists of texts, so only one chunk is held in memory at a time
+    """
+    normalize = None
+    if preprocess:
+        from preprocess import normalize
+    
+    chunk = []
+    for line in _read_lines(path):
+        text = normalize(line) if normalize else line.strip()
+        if not text:
+            continue
+        chunk.append(text)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@cache
+def _sentiment_cells() -> Tuple[Dict[str, "Text"], "Text"]:
+    """Prebuilt sentiment and error cells, so rows need no markup parsing"""
+    from rich.text import Text
+    return {
+        'positive': Text('positive', style='green'),
+        'negative': Text('negative', style='red'),
+    }, Text('error', style='red')
+
+
+def _format_numbers(predictions: List[dict]) -> Tuple[List[str], List[str]]:
+    """
+    Format confidence and latency columns for successful predictions
+    
+    Large batches are formatted with one vectorized NumPy call per column when
+    NumPy is installed; below VECTORIZE_MIN_ROWS the array setup costs more
+    than it saves.
+    
+    Returns:
+        Confidence strings and latency strings, in prediction order
+    """
+    if len(predictions) > VECTORIZE_MIN_ROWS:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            count = len(predictions)
+            confs = np.fromiter((p['confidence'] for p in predictions), dtype=np.float64, count=count)
+            latencies = np.fromiter((p['latency_ms'] for p in predictions), dtype=np.float64, count=count)
+            return (
+                np.char.mod('%.2f%%', confs * 100).tolist(),
+                np.char.mod('%.2f', latencies).tolist()
+            )
+    
+    return (
+        [f"{p['confidence']:.2%}" for p in predictions],
+        [f"{p['latency_ms']:.2f}" for p in predictions]
+    )
+
+
+def _batch_rows(texts: List[str], predictions: List[dict]) -> List[Tuple]:
+    """Format batch predictions as (text, sentiment, confidence, latency) rows"""
+    confidences, latencies = map(iter, _format_numbers([p for p in predictions if 'error' not in p]))
+    previews = [text if len(text) <= 50 else text[:47] + "..." for text in texts]
+    rows = []
+    for text_preview, pred in zip(previews, predictions):
+        if 'error' in pred:
+            rows.append((text_preview, None, "-", "-"))
+        else:
+            rows.append((text_preview, pred['sentiment'], next(confidences), next(latencies)))
+    return rows
+
+
+def _print_batch_result(texts: List[str], result: dict, offset: int, as_json: bool, plain: bool = False):
+    """Print one chunk of batch predictions as a table, TSV or NDJSON"""
+    # Machine consumers get one JSON prediction per line and no table at all
+    if as_json:
+        sys.stdout.buffer.write(b"".join(_dumps(pred) + b"\n" for pred in result['predictions']))
+        return
+    
+    console = _get_console()
+    rows = _batch_rows(texts, result['predictions'])
+    
+    if plain:
+        sys.stdout.write("".join(
+            f"{text}\t{sentiment or 'error'}\t{confidence}\t{latency}\n"
+            for text, sentiment, confidence, latency in rows
+        ))
+    else:
+        from rich.table import Table
+        from rich.text import Text
+        
+        sentiment_cells, error_cell = _sentiment_cells()
+        table = Table(
+            title=f"Batch Prediction Results (items {offset + 1}-{offset + len(texts)})",
+            highlight=False
+        )
+        table.add_column("Text", style="cyan", max_width=50)
+        table.add_column("Sentiment", style="bold")
+        table.add_column("Confidence", style="green")
+        table.add_column("Latency (ms)", style="yellow")
+        
+        for text, sentiment, confidence, latency in rows:
+            table.add_row(
+                Text(text),
+                sentiment_cells.get(sentiment, error_cell),
+                confidence,
+                latency
+            )
+        
+        console.print(table)
 
 
 def cmd_health(args):
     """Health check command"""
-    client = SentimentClient(args.url)
+    from rich.panel import Panel
+    
+    console = _get_console()
+    client = _make_client(args)
     
     try:
         result = client.health_check()
@@ -92,7 +507,7 @@ def cmd_health(args):
             title="Health Check",
             border_style=status_color
         ))
-        
+    
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
@@ -100,7 +515,10 @@ def cmd_health(args):
 
 def cmd_metrics(args):
     """Metrics command"""
-    client = SentimentClient(args.url)
+    from rich.table import Table
+    
+    console = _get_console()
+    client = _make_client(args)
     
     try:
         result = client.get_metrics()
@@ -121,7 +539,7 @@ def cmd_metrics(args):
         console.print("\n[bold]Model Information:[/bold]")
         for key, value in result['model_info'].items():
             console.print(f"  {key}: {value}")
-        
+    
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
@@ -129,7 +547,10 @@ def cmd_metrics(args):
 
 def cmd_predict(args):
     """Predict command"""
-    client = SentimentClient(args.url)
+    from rich.panel import Panel
+    
+    console = _get_console()
+    client = _make_client(args)
     
     try:
         # Read input
@@ -146,6 +567,20 @@ def cmd_predict(args):
             request_id=args.request_id
         )
         
+        # Pipes get plain lines without building a Rich panel
+        if not _stdout_is_tty():
+            lines = [
+                f"Sentiment: {result['sentiment'].upper()}",
+                f"Confidence: {result['confidence']:.2%}",
+                f"Latency: {result['latency_ms']:.2f}ms"
+            ]
+            if result.get('probabilities'):
+                lines += [f"  {label}: {prob:.2%}" for label, prob in result['probabilities'].items()]
+            if args.json:
+                lines.append(_dumps(result).decode())
+            print("\n".join(lines))
+            return
+        
         # Display result
         sentiment_color = "green" if result['sentiment'] == 'positive' else "red"
         
@@ -166,7 +601,7 @@ def cmd_predict(args):
         if args.json:
             console.print("\n[dim]JSON Output:[/dim]")
             console.print_json(data=result)
-        
+    
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
@@ -174,55 +609,163 @@ def cmd_predict(args):
 
 def cmd_batch(args):
     """Batch prediction command"""
-    client = SentimentClient(args.url)
+    console = _get_console()
+    client = _make_client(args)
     
     try:
-        # Read texts from file
-        with open(args.file, 'r') as f:
-            texts = [line.strip() for line in f if line.strip()]
-        
-        console.print(f"Processing {len(texts)} texts...")
+        processed = 0
+        total_latency = 0.0
+        # Tables are only worth rendering for a terminal
+        plain = args.plain or not _stdout_is_tty()
         
-        # Make batch prediction
-        result = client.predict_batch(
-            texts=texts,
-            return_probabilities=args.probabilities
-        )
+        def report(chunk: List[str], result: dict):
+            nonlocal processed, total_latency
+            _print_batch_result(chunk, result, processed, args.json, plain)
+            processed += len(chunk)
+            total_latency += result['total_latency_ms']
         
-        # Display results
-        table = Table(title=f"Batch Prediction Results ({len(result['predictions'])} items)")
-        table.add_column("Text", style="cyan", max_width=50)
-        table.add_column("Sentiment", style="bold")
-        table.add_column("Confidence", style="green")
-        table.add_column("Latency (ms)", style="yellow")
+        async def run_concurrent():
+            async with client.async_client() as async_client:
+                for chunk in _chunks(args.file, args.chunk_size, args.preprocess):
+                    result = await client.predict_batch_async(
+                        texts=chunk,
+                        return_probabilities=args.probabilities,
+                        concurrency=args.concurrency,
+                        client=async_client
+                    )
+                    report(chunk, result)
         
-        for idx, pred in enumerate(result['predictions']):
-            text_preview = texts[idx][:47] + "..." if len(texts[idx]) > 50 else texts[idx]
-            sentiment_style = "green" if pred['sentiment'] == 'positive' else "red"
+        def run_parallel():
+            from collections import deque
+            from concurrent.futures import ThreadPoolExecutor
             
-            table.add_row(
-                text_preview,
-                f"[{sentiment_style}]{pred['sentiment']}[/{sentiment_style}]",
-                f"{pred['confidence']:.2%}",
-                f"{pred['latency_ms']:.2f}"
-            )
+            # Chunks are submitted in file order and reported from the head of
+            # the queue, so output order is preserved; at most two chunks per
+            # worker are in flight to keep memory bounded
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+                for chunk in _chunks(args.file, args.chunk_size, args.preprocess):
+                    pending.append((chunk, executor.submit(client.predict_batch, chunk, args.probabilities)))
+                    if len(pending) >= 2 * args.parallel:
+                        chunk, future = pending.popleft()
+                        report(chunk, future.result())
+                while pending:
+                    chunk, future = pending.popleft()
+                    report(chunk, future.result())
         
-        console.print(table)
-        console.print(f"\nTotal latency: {result['total_latency_ms']:.2f}ms")
+        # Fan out concurrent single predictions, or send one batch request per chunk
+        if args.concurrency > 0:
+            import asyncio
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                pass
+            asyncio.run(run_concurrent())
+        elif args.parallel > 1:
+            run_parallel()
+        else:
+            for chunk in _chunks(args.file, args.chunk_size, args.preprocess):
+                result = client.predict_batch(
+                    texts=chunk,
+                    return_probabilities=args.probabilities
+                )
+                report(chunk, result)
         
-        # JSON output if requested
+        summary = f"Processed {processed} texts, total latency: {total_latency:.2f}ms"
         if args.json:
-            console.print("\n[dim]JSON Output:[/dim]")
-            console.print_json(data=result)
-        
+            # Keep stdout pure NDJSON
+            sys.stderr.write(summary + "\n")
+        else:
+            console.print(f"\n{summary}", highlight=False)
+    
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 
+# Piped interactive input is coalesced into batch requests of up to
+# PIPE_MAX_BATCH lines, waiting at most PIPE_MAX_WAIT_S for more input
+PIPE_MAX_BATCH = 64
+PIPE_MAX_WAIT_S = 0.05
+QUIT_COMMANDS = ('quit', 'exit', 'q')
+
+
+def _print_interactive_result(result: dict):
+    """Print one prediction in the interactive one-line format"""
+    if not _stdout_is_tty():
+        sys.stdout.write(
+            f"  {result['sentiment'].upper()} "
+            f"(confidence: {result['confidence']:.2%}, "
+            f"latency: {result['latency_ms']:.2f}ms)\n\n"
+        )
+        return
+    
+    console = _get_console()
+    sentiment_color = "green" if result['sentiment'] == 'positive' else "red"
+    console.print(
+        f"  [{sentiment_color}]{result['sentiment'].upper()}[/{sentiment_color}] "
+        f"(confidence: {result['confidence']:.2%}, "
+        f"latency: {result['latency_ms']:.2f}ms)\n"
+    )
+
+
+def _interactive_piped(client: SentimentClient):
+    """Read non-TTY stdin on a background thread and predict lines in batches"""
+    import queue
+    
+    console = _get_console()
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+    
+    def read_stdin():
+        for line in sys.stdin:
+            lines.put(line)
+        lines.put(None)
+    
+    threading.Thread(target=read_stdin, daemon=True).start()
+    
+    done = False
+    while not done:
+        batch = []
+        item = lines.get()
+        deadline = time.monotonic() + PIPE_MAX_WAIT_S
+        
+        while True:
+            text = item.strip() if item is not None else None
+            if text is None or text.lower() in QUIT_COMMANDS:
+                done = True
+                break
+            if text:
+                batch.append(text)
+            if len(batch) >= PIPE_MAX_BATCH:
+                break
+            try:
+                item = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+        
+        if not batch:
+            continue
+        try:
+            result = client.predict_batch(texts=batch, return_probabilities=True)
+        except Exception as e:
+            console.print(f"[red]Error: {str(e)}[/red]\n")
+            continue
+        for pred in result['predictions']:
+            _print_interactive_result(pred)
+    
+    console.print("[yellow]Goodbye![/yellow]")
+
+
 def cmd_interactive(args):
     """Interactive mode"""
-    client = SentimentClient(args.url)
+    console = _get_console()
+    client = _make_client(args)
+    
+    # Piped input: batch lines instead of one request per line
+    if not sys.stdin.isatty():
+        _interactive_piped(client)
+        return
     
     console.print("[bold green]Interactive Sentiment Analysis[/bold green]")
     console.print("Type your text and press Enter to analyze. Type 'quit' to exit.\n")
@@ -231,7 +774,7 @@ def cmd_interactive(args):
         try:
             text = console.input("[bold cyan]Text:[/bold cyan] ")
             
-            if text.lower() in ['quit', 'exit', 'q']:
+            if text.lower() in QUIT_COMMANDS:
                 console.print("[yellow]Goodbye![/yellow]")
                 break
             
@@ -239,14 +782,8 @@ def cmd_interactive(args):
                 continue
             
             result = client.predict(text=text, return_probabilities=True)
-            
-            sentiment_color = "green" if result['sentiment'] == 'positive' else "red"
-            console.print(
-                f"  [{sentiment_color}]{result['sentiment'].upper()}[/{sentiment_color}] "
-                f"(confidence: {result['confidence']:.2%}, "
-                f"latency: {result['latency_ms']:.2f}ms)\n"
-            )
-            
+            _print_interactive_result(result)
+        
         except KeyboardInterrupt:
             console.print("\n[yellow]Goodbye![/yellow]")
             break
@@ -254,6 +791,24 @@ def cmd_interactive(args):
             console.print(f"[red]Error: {str(e)}[/red]\n")
 
 
+def _check_batch_args(parser: argparse.ArgumentParser, args):
+    """Reject batch options that are out of range or have no effect together"""
+    if not 1 <= args.chunk_size <= MAX_BATCH_TEXTS:
+        parser.error(f"--chunk-size must be between 1 and {MAX_BATCH_TEXTS}")
+    if args.concurrency < 0:
+        parser.error("--concurrency must be 0 or more")
+    if not 1 <= args.parallel <= 64:
+        parser.error("--parallel must be between 1 and 64")
+    
+    # With --concurrency each text is sent as its own /predict request, so the
+    # batch-request options would be silently ignored
+    if args.concurrency > 0:
+        if args.parallel > 1:
+            parser.error("--parallel only applies to batch requests; add --concurrency 0")
+        if args.gzip:
+            parser.error("--gzip only applies to batch requests; add --concurrency 0")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="CLI tool for Sentiment Analysis API",
@@ -263,7 +818,17 @@ def main():
     parser.add_argument(
         '--url',
         default='http://localhost:8000',
-        help='API base URL (default: http://localhost:8000)'
+        help='API base URL, or unix:///path/to.sock for a local socket (default: http://localhost:8000)'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Gzip-compress large batch request bodies'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always send requests instead of reusing earlier predictions'
     )
     
     subparsers = parser.add_subparsers(dest='command', help='Commands')
@@ -286,7 +851,35 @@ def main():
     batch_parser = subparsers.add_parser('batch', help='Batch prediction from file')
     batch_parser.add_argument('file', help='File with one text per line')
     batch_parser.add_argument('-p', '--probabilities', action='store_true', help='Return probabilities')
-    batch_parser.add_argument('-j', '--json', action='store_true', help='Output JSON')
+    batch_parser.add_argument('-j', '--json', action='store_true', help='Write predictions as newline-delimited JSON')
+    batch_parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        default=32,
+        help='Concurrent single requests (0 = one batch request)'
+    )
+    batch_parser.add_argument(
+        '-P', '--parallel',
+        type=int,
+        default=1,
+        help='Batch requests in flight at once when --concurrency is 0 (max 64)'
+    )
+    batch_parser.add_argument(
+        '--preprocess',
+        action='store_true',
+        help='Lowercase, strip URLs and collapse whitespace before sending'
+    )
+    batch_parser.add_argument(
+        '--plain',
+        action='store_true',
+        help='Write tab-separated rows instead of tables (default when not a terminal)'
+    )
+    batch_parser.add_argument(
+        '-n', '--chunk-size',
+        type=int,
+        default=MAX_BATCH_TEXTS,
+        help=f'Texts read and sent per chunk, 1-{MAX_BATCH_TEXTS} (the batch endpoint limit)'
+    )
     
     # Interactive command
     subparsers.add_parser('interactive', help='Interactive mode')
@@ -297,6 +890,9 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    if args.command == 'batch':
+        _check_batch_args(parser, args)
+    
     # Route to command handlers
     commands = {
         'health': cmd_health,
@@ -306,6 +902,11 @@ def main():
         'interactive': cmd_interactive
     }
     
+    # Compile the preprocessing JIT before any request is timed
+    if getattr(args, 'preprocess', False):
+        import preprocess
+        preprocess.warmup()
+    
     commands[args.command](args)
 
 
@@ -10,6 +10,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import requests
 from typing import Optional, List, Dict
 
+# Emoji shown next to each sentiment label
+SENT_EMOJI = {"positive": "😊", "negative": "😞"}
+
 
 class SentimentAPIClient:
     """Python client for Sentiment Analysis API"""
@@ -91,23 +94,12 @@ def main():
         for label, prob in result['probabilities'].items():
             print(f"     - {label}: {prob:.2%}")
     
-    # 3. Batch prediction
-    print("\n3. Batch prediction:")
+    # Steps 3 and 4 share one batch request; the predictions come back in order
     texts = [
         "Great service!",
         "Terrible experience",
         "It's okay, nothing special"
     ]
-    batch_result = client.predict_batch(texts, return_probabilities=True)
-    
-    for i, pred in enumerate(batch_result['predictions']):
-        print(f"\n   Text {i+1}: {texts[i]}")
-        print(f"   Sentiment: {pred['sentiment']} ({pred['confidence']:.2%})")
-    
-    print(f"\n   Total latency: {batch_result['total_latency_ms']:.2f}ms")
-    
-    # 4. Different sentiments
-    print("\n4. Testing various sentiments:")
     test_cases = [
         "I absolutely love this!",
         "This is the worst thing ever.",
@@ -115,10 +107,21 @@ def main():
         "Exceeded my expectations!",
         "Very disappointed."
     ]
+    batch_result = client.predict_batch(texts + test_cases, return_probabilities=True)
+    predictions = batch_result['predictions']
     
-    for text in test_cases:
-        result = client.predict(text)
-        emoji = "😊" if result['sentiment'] == 'positive' else "😞"
+    # 3. Batch prediction
+    print("\n3. Batch prediction:")
+    for i, pred in enumerate(predictions[:len(texts)]):
+        print(f"\n   Text {i+1}: {texts[i]}")
+        print(f"   Sentiment: {pred['sentiment']} ({pred['confidence']:.2%})")
+    
+    print(f"\n   Total latency (steps 3 and 4): {batch_result['total_latency_ms']:.2f}ms")
+    
+    # 4. Different sentiments
+    print("\n4. Testing various sentiments:")
+    for text, result in zip(test_cases, predictions[len(texts):]):
+        emoji = SENT_EMOJI.get(result['sentiment'], "•")
         print(f"   {emoji} \"{text}\" → {result['sentiment']} ({result['confidence']:.2%})")
     
     print("\n" + "=" * 60)
@@ -5,28 +5,90 @@ Demonstrates Groq/Gemini integration features
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import asyncio
 import json
-from typing import List, Dict, Optional
+import copy
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+from typing import List, Dict, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Decode responses with orjson when it is installed (it is a server dependency)
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
 console = Console()
 
 BASE_URL = "http://localhost:8001"
 
+# Rich color for each sentiment label in the demo tables
+SENT_COLOR = {"positive": "green", "negative": "red", "neutral": "yellow"}
+
+
+def make_session() -> requests.Session:
+    """Create a keep-alive session with a connection pool for the API"""
+    session = requests.Session()
+    # Absorb transient LLM rate limits and gateway errors with a short jittered
+    # backoff; after the last attempt raise_for_status() reports the status
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        backoff_jitter=0.25,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+    return session
+
+
+# Shared by every client below so the demos reuse the same connections
+SESSION = make_session()
+
 
 class EnhancedSentimentClient:
     """Client for enhanced sentiment analysis with LLM features"""
     
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        session: Optional[requests.Session] = None,
+        cache_ttl: float = 300,
+        cache_max: int = 512
+    ):
         self.base_url = base_url
+        self.session = session or SESSION
+        # Recent analyze_with_insights results keyed by (text, provider), least recently used first
+        self._cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, Dict]]" = OrderedDict()
+        self._cache_ttl = cache_ttl
+        self._cache_max = cache_max
+        self._cache_lock = Lock()
     
     def analyze_with_insights(
         self,
         text: str,
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        no_cache: bool = False
     ) -> Dict:
         """
         Analyze text with enhanced LLM insights
@@ -34,10 +96,17 @@ class EnhancedSentimentClient:
         Args:
             text: Text to analyze
             provider: LLM provider ('groq', 'gemini', or None for auto)
+            no_cache: Always call the API, bypassing the local result cache
         
         Returns:
             Full analysis result with enhanced insights
         """
+        key = (text, provider)
+        if not no_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+        
         payload = {
             "text": text,
             "enhanced": True,
@@ -47,12 +116,35 @@ class EnhancedSentimentClient:
         if provider:
             payload["llm_provider"] = provider
         
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/api/v1/predict",
             json=payload
         )
         response.raise_for_status()
-        return response.json()
+        result = loads(response.content)
+        self._cache_set(key, result)
+        return result
+    
+    def _cache_get(self, key: Tuple[str, Optional[str]]) -> Optional[Dict]:
+        """Return a copy of the cached result for key, or None if missing or expired"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at >= self._cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def _cache_set(self, key: Tuple[str, Optional[str]], result: Dict):
+        """Store a copy of result, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), copy.deepcopy(result))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_max:
+                self._cache.popitem(last=False)
     
     def batch_analyze_with_trends(
         self,
@@ -78,12 +170,12 @@ class EnhancedSentimentClient:
         if provider:
             payload["llm_provider"] = provider
         
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/api/v1/predict/batch",
             json=payload
         )
         response.raise_for_status()
-        return response.json()
+        return loads(response.content)
     
     def compare_providers(self, text: str) -> Dict:
         """
@@ -95,31 +187,116 @@ class EnhancedSentimentClient:
         Returns:
             Results from auto, groq, and gemini
         """
-        results = {}
+        providers = [None, "groq", "gemini"]
+        results = {provider or "auto": None for provider in providers}
         
-        for provider in [None, "groq", "gemini"]:
-            try:
-                result = self.analyze_with_insights(text, provider)
-                provider_name = provider or "auto"
-                results[provider_name] = {
-                    "sentiment": result["sentiment"],
-                    "confidence": result["confidence"],
-                    "latency_ms": result["latency_ms"],
-                    "explanation": result.get("enhanced_analysis", {}).get("explanation", "N/A"),
-                    "key_phrases": result.get("enhanced_analysis", {}).get("key_phrases", [])
-                }
-            except Exception as e:
-                results[provider_name] = {"error": str(e)}
+        # The calls are independent, so wait for the slowest instead of the sum
+        with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+            futures = {
+                executor.submit(self.analyze_with_insights, text, provider): provider or "auto"
+                for provider in providers
+            }
+            for future in as_completed(futures):
+                provider_name = futures[future]
+                try:
+                    results[provider_name] = _provider_summary(future.result())
+                except Exception as e:
+                    results[provider_name] = {"error": str(e)}
         
         return results
 
 
-def demo_single_analysis():
+class AsyncEnhancedSentimentClient:
+    """
+    Async client for the enhanced endpoints
+    
+    All calls share one httpx connection pool; with the http2 extra installed
+    and a server that negotiates it, they are multiplexed on one connection.
+    """
+    
+    def __init__(self, base_url: str = BASE_URL, timeout: float = 30.0):
+        self.base_url = base_url
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=timeout
+        )
+    
+    async def __aenter__(self) -> "AsyncEnhancedSentimentClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        await self._client.aclose()
+    
+    async def analyze_with_insights(self, text: str, provider: Optional[str] = None) -> Dict:
+        """
+        Analyze text with enhanced LLM insights
+        
+        Args:
+            text: Text to analyze
+            provider: LLM provider ('groq', 'gemini', or None for auto)
+        
+        Returns:
+            Full analysis result with enhanced insights
+        """
+        payload = {
+            "text": text,
+            "enhanced": True,
+            "return_probabilities": True
+        }
+        
+        if provider:
+            payload["llm_provider"] = provider
+        
+        response = await self._client.post(f"{self.base_url}/api/v1/predict", json=payload)
+        response.raise_for_status()
+        return loads(response.content)
+    
+    async def compare_providers(self, text: str) -> Dict:
+        """
+        Compare results from different providers
+        
+        Args:
+            text: Text to analyze
+        
+        Returns:
+            Results from auto, groq, and gemini
+        """
+        providers = [None, "groq", "gemini"]
+        responses = await asyncio.gather(
+            *(self.analyze_with_insights(text, provider) for provider in providers),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for provider, result in zip(providers, responses):
+            if isinstance(result, Exception):
+                results[provider or "auto"] = {"error": str(result)}
+            else:
+                results[provider or "auto"] = _provider_summary(result)
+        return results
+
+
+def _provider_summary(result: Dict) -> Dict:
+    """Reduce a prediction response to the fields shown in the provider comparison"""
+    enhanced = result.get("enhanced_analysis", {})
+    return {
+        "sentiment": result["sentiment"],
+        "confidence": result["confidence"],
+        "latency_ms": result["latency_ms"],
+        "explanation": enhanced.get("explanation", "N/A"),
+        "key_phrases": enhanced.get("key_phrases", [])
+    }
+
+
+def demo_single_analysis(client: EnhancedSentimentClient):
     """Demo: Single text analysis with enhanced insights"""
     console.print("\n[bold cyan]Demo 1: Enhanced Single Text Analysis[/bold cyan]\n")
     
-    client = EnhancedSentimentClient()
-    
     text = "This product exceeded all my expectations! The quality is outstanding and customer service was incredibly helpful. Highly recommend!"
     
     console.print(f"[yellow]Analyzing:[/yellow] {text}\n")
@@ -149,12 +326,10 @@ def demo_single_analysis():
         console.print(f"\n[yellow]Reasoning:[/yellow]\n{enhanced['reasoning']}")
 
 
-def demo_negative_feedback():
+def demo_negative_feedback(client: EnhancedSentimentClient):
     """Demo: Negative feedback with actionable suggestions"""
     console.print("\n[bold cyan]Demo 2: Negative Feedback Analysis[/bold cyan]\n")
     
-    client = EnhancedSentimentClient()
-    
     text = "Terrible experience! The product arrived damaged, customer service was unresponsive, and getting a refund was a nightmare. Would not recommend to anyone."
     
     console.print(f"[yellow]Analyzing Complaint:[/yellow] {text}\n")
@@ -179,12 +354,10 @@ def demo_negative_feedback():
             console.print(f"  {i}. {suggestion}")
 
 
-def demo_batch_insights():
+def demo_batch_insights(client: EnhancedSentimentClient):
     """Demo: Batch analysis with trend insights"""
     console.print("\n[bold cyan]Demo 3: Batch Analysis with Trends[/bold cyan]\n")
     
-    client = EnhancedSentimentClient()
-    
     reviews = [
         "Absolutely love this product! Best purchase I've made this year.",
         "Disappointed with the quality. Not worth the price.",
@@ -208,12 +381,17 @@ def demo_batch_insights():
     table.add_column("Sentiment", justify="center")
     table.add_column("Confidence", justify="right")
     
-    for pred in result["predictions"][:5]:  # Show first 5
-        sentiment_color = "green" if pred["sentiment"] == "positive" else "red"
+    # Predictions come back in request order, so pair them with their reviews
+    rows = [
+        (text[:50], pred["sentiment"], pred["confidence"])
+        for text, pred in zip(reviews[:5], result["predictions"][:5])  # Show first 5
+    ]
+    for text, sentiment, confidence in rows:
+        sentiment_color = SENT_COLOR.get(sentiment, "yellow")
         table.add_row(
-            result["predictions"][0]["request_id"],  # Would show text in real impl
-            f"[{sentiment_color}]{pred['sentiment'].upper()}[/{sentiment_color}]",
-            f"{pred['confidence']:.2%}"
+            text,
+            f"[{sentiment_color}]{sentiment.upper()}[/{sentiment_color}]",
+            f"{confidence:.2%}"
         )
     
     console.print(table)
@@ -245,17 +423,19 @@ def demo_batch_insights():
             console.print(f"  {insights['recommendation']}")
 
 
-def demo_provider_comparison():
+def demo_provider_comparison(client: EnhancedSentimentClient):
     """Demo: Compare different LLM providers"""
     console.print("\n[bold cyan]Demo 4: Provider Comparison[/bold cyan]\n")
     
-    client = EnhancedSentimentClient()
-    
     text = "The service was okay, nothing special but not terrible either."
     
     console.print(f"[yellow]Comparing providers for:[/yellow] {text}\n")
     
-    results = client.compare_providers(text)
+    async def compare():
+        async with AsyncEnhancedSentimentClient(client.base_url) as async_client:
+            return await async_client.compare_providers(text)
+    
+    results = asyncio.run(compare())
     
     table = Table(title="Provider Comparison")
     table.add_column("Provider", style="cyan")
@@ -274,7 +454,7 @@ def demo_provider_comparison():
                 f"[red]Error[/red]"
             )
         else:
-            sentiment_color = "green" if result["sentiment"] == "positive" else "red"
+            sentiment_color = SENT_COLOR.get(result["sentiment"], "yellow")
             table.add_row(
                 provider.upper(),
                 f"[{sentiment_color}]{result['sentiment'].upper()}[/{sentiment_color}]",
@@ -292,12 +472,10 @@ def demo_provider_comparison():
             console.print(f"  {result['explanation']}")
 
 
-def demo_multilingual():
+def demo_multilingual(client: EnhancedSentimentClient):
     """Demo: Multi-language support"""
     console.print("\n[bold cyan]Demo 5: Multi-Language Analysis[/bold cyan]\n")
     
-    client = EnhancedSentimentClient()
-    
     texts = {
         "English": "This is absolutely fantastic!",
         "Spanish": "¡Esto es absolutamente fantástico!",
@@ -311,10 +489,20 @@ def demo_multilingual():
     table.add_column("Sentiment", justify="center")
     table.add_column("Confidence", justify="right")
     
-    for lang, text in texts.items():
+    # Each text needs its own language detection and translation, which only the
+    # single predict endpoint does, so send them concurrently rather than as a batch
+    async def analyze_all():
+        async with AsyncEnhancedSentimentClient(client.base_url) as async_client:
+            return await asyncio.gather(
+                *(async_client.analyze_with_insights(text) for text in texts.values()),
+                return_exceptions=True
+            )
+    
+    for (lang, text), result in zip(texts.items(), asyncio.run(analyze_all())):
         try:
-            result = client.analyze_with_insights(text)
-            sentiment_color = "green" if result["sentiment"] == "positive" else "red"
+            if isinstance(result, Exception):
+                raise result
+            sentiment_color = SENT_COLOR.get(result["sentiment"], "yellow")
             table.add_row(
                 lang,
                 text,
@@ -334,9 +522,12 @@ def main():
     console.print("[bold magenta]  Groq & Gemini Integration                [/bold magenta]")
     console.print("[bold magenta]═══════════════════════════════════════════[/bold magenta]\n")
     
+    # One client for every demo, so they share its session and result cache
+    client = EnhancedSentimentClient()
+    
     try:
-        # Check if server is running
-        response = requests.get(f"{BASE_URL}/health")
+        # Check if server is running (this also opens the pooled connection)
+        response = client.session.get(f"{client.base_url}/health")
         if response.status_code == 200:
             console.print("[green]✓ Server is running[/green]\n")
         else:
@@ -369,12 +560,12 @@ def main():
     
     if choice == '0':
         for _, _, demo_func in demos:
-            demo_func()
+            demo_func(client)
             console.input("\n[dim]Press Enter to continue...[/dim]\n")
     else:
         for num, _, demo_func in demos:
             if choice == num:
-                demo_func()
+                demo_func(client)
                 break
         else:
             console.print("[red]Invalid choice![/red]")
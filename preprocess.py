@@ -0,0 +1,66 @@
+"""
+Client-side text normalization applied before texts are sent to the API
+Lowercases, removes URLs, and collapses whitespace; the byte-level pass is
+JIT-compiled with Numba when it is installed
+"""
+import re
+from typing import List
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+")
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _normalize_ascii(src: "np.ndarray") -> "np.ndarray":
+        """Lowercase ASCII bytes and collapse whitespace runs to one space"""
+        out = np.empty(src.shape[0], dtype=np.uint8)
+        n = 0
+        pending_space = False
+        for b in src:
+            # space, \t, \n, \v, \f, \r
+            if b == 32 or (9 <= b <= 13):
+                pending_space = n > 0
+                continue
+            if pending_space:
+                out[n] = 32
+                n += 1
+                pending_space = False
+            if 65 <= b <= 90:
+                b += 32
+            out[n] = b
+            n += 1
+        return out[:n]
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize one text for sentiment prediction
+    
+    Args:
+        text: Raw input text
+    
+    Returns:
+        Lowercased text without URLs and with single spaces between words
+    """
+    text = URL_PATTERN.sub(" ", text)
+    if NUMBA_AVAILABLE and text.isascii():
+        raw = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        return _normalize_ascii(raw).tobytes().decode("ascii")
+    return " ".join(text.lower().split())
+
+
+def normalize_many(texts: List[str]) -> List[str]:
+    """Normalize a list of texts, dropping any that end up empty"""
+    return [normalized for normalized in map(normalize, texts) if normalized]
+
+
+def warmup():
+    """Compile the JIT path up front so the first request does not pay for it"""
+    normalize("Warm Up  text")
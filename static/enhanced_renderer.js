@@ -0,0 +1,142 @@
+// Renderers for the LLM enhanced analysis, loaded by the dashboard on first use
+
+const PHRASE_STYLES = Object.freeze({
+    positive: Object.freeze({ color: '#10b981', bgColor: '#064e3b', label: '[+]' }),
+    negative: Object.freeze({ color: '#ef4444', bgColor: '#7f1d1d', label: '[-]' }),
+    neutral: Object.freeze({ color: '#fbbf24', bgColor: '#78350f', label: '[-]' })
+});
+
+// Key phrase rows: compact is the variant inside the probabilities box
+const PHRASE_ROW = Object.freeze({
+    compact: (s, item, sentiment) =>
+        `<div style="margin-bottom: 8px; padding: 8px; background: ${s.bgColor}; border-radius: 4px; border-left: 3px solid ${s.color};">` +
+        `<div style="display: flex; justify-content: space-between; align-items: center;">` +
+        `<span style="color: #e0e0e0; font-weight: 500; font-size: 0.9em;">${s.label} "${item.phrase}"</span>` +
+        `<span style="color: ${s.color}; font-weight: bold;">${item.score}%</span>` +
+        `</div>` +
+        `<div style="margin-top: 3px; font-size: 0.8em; color: #9ca3af;">Sentiment: ${sentiment}</div>` +
+        `</div>`,
+    full: (s, item, sentiment) =>
+        `<div style="margin-bottom: 10px; padding: 10px; background: ${s.bgColor}; border-radius: 6px; border-left: 3px solid ${s.color};">` +
+        `<div style="display: flex; justify-content: space-between; align-items: center;">` +
+        `<span style="color: #e0e0e0; font-weight: 500;">${s.label} "${item.phrase}"</span>` +
+        `<span style="color: ${s.color}; font-weight: bold; font-size: 1.1em;">${item.score}%</span>` +
+        `</div>` +
+        `<div style="margin-top: 4px; font-size: 0.85em; color: #9ca3af;">Sentiment: ${sentiment}</div>` +
+        `</div>`
+});
+
+function renderPhraseList(items, { compact }) {
+    const row = compact ? PHRASE_ROW.compact : PHRASE_ROW.full;
+    return items.map(item => {
+        const s = PHRASE_STYLES[item.sentiment] || PHRASE_STYLES.neutral;
+        const sentiment = item.sentiment.charAt(0).toUpperCase() + item.sentiment.slice(1);
+        return row(s, item, sentiment);
+    }).join('');
+}
+
+// Positive / negative (/ neutral) score boxes
+function renderOverallScore(score, compact) {
+    const box = compact
+        ? (bg, color, name, value) =>
+            '<div style="flex: 1; padding: 8px; background: ' + bg + '; border-radius: 4px; border: 2px solid ' + color + ';">' +
+            '<div style="color: #9ca3af; font-size: 0.75em;">' + name + '</div>' +
+            '<div style="color: ' + color + '; font-size: 1.2em; font-weight: bold;">' + value + '%</div>' +
+            '</div>'
+        : (bg, color, name, value) =>
+            '<div style="flex: 1; padding: 12px; background: ' + bg + '; border-radius: 6px; border: 2px solid ' + color + ';">' +
+            '<div style="color: #9ca3af; font-size: 0.85em; margin-bottom: 4px;">' + name + '</div>' +
+            '<div style="color: ' + color + '; font-size: 1.5em; font-weight: bold;">' + value + '%</div>' +
+            '</div>';
+
+    const parts = compact
+        ? ['<div style="margin-top: 12px; padding-top: 12px; border-top: 1px solid #3a3a5a;">',
+           '<div style="display: flex; gap: 10px; margin-top: 8px;">']
+        : ['<div style="margin-bottom: 20px;">',
+           '<h5 style="color: #fbbf24; margin-bottom: 12px;">Overall Sentiment Score</h5>',
+           '<div style="display: flex; gap: 15px;">'];
+    parts.push(box('#064e3b', '#10b981', 'Positive', score.positive));
+    parts.push(box('#7f1d1d', '#ef4444', 'Negative', score.negative));
+    if (score.neutral && score.neutral > 0) {
+        parts.push(box('#78350f', '#fbbf24', 'Neutral', score.neutral));
+    }
+    parts.push('</div></div>');
+    return parts.join('');
+}
+
+// Titled paragraph in the enhanced analysis panel
+function renderSection(title, color, text, extraStyle) {
+    return '<div style="margin-bottom: 20px;">' +
+        '<h5 style="color: ' + color + '; margin-bottom: 8px;">' + title + '</h5>' +
+        '<p style="color: #e0e0e0; line-height: 1.6;' + (extraStyle || '') + '">' + text + '</p>' +
+        '</div>';
+}
+
+function keyPhrases(analysis) {
+    const phrases = analysis.key_phrases_detailed;
+    return phrases && phrases.length > 0 ? phrases : null;
+}
+
+/**
+ * Compact phrase breakdown for the probabilities box
+ * Returns '' when there are no scored phrases, so the caller shows plain probabilities.
+ */
+export function renderProbabilityBreakdown(analysis) {
+    const phrases = keyPhrases(analysis);
+    if (!phrases) return '';
+
+    const list = renderPhraseList(phrases, { compact: true });
+    return analysis.overall_score ? list + renderOverallScore(analysis.overall_score, true) : list;
+}
+
+/** Full "Enhanced Analysis" panel for a prediction response */
+export function renderEnhanced(data) {
+    const analysis = data.enhanced_analysis;
+    const phrases = keyPhrases(analysis);
+    const parts = [
+        '<div style="margin-top: 20px; padding: 20px; background: #1a1a2e; border-radius: 8px; border-left: 4px solid #667eea;">',
+        '<h4 style="color: #667eea; margin-bottom: 15px;">Enhanced Analysis</h4>'
+    ];
+
+    if (phrases) {
+        parts.push('<div style="margin-bottom: 20px;">');
+        parts.push('<h5 style="color: #ec4899; margin-bottom: 12px;">Key Phrases with Sentiment Scores</h5>');
+        parts.push(renderPhraseList(phrases, { compact: false }));
+        parts.push('</div>');
+    }
+
+    if (analysis.overall_score) {
+        parts.push(renderOverallScore(analysis.overall_score, false));
+    }
+
+    parts.push(renderSection('Detailed Explanation', '#10b981', analysis.explanation));
+    if (analysis.dominant_factor) {
+        parts.push(renderSection('Dominant Factor', '#a78bfa', analysis.dominant_factor, ' font-weight: 500;'));
+    }
+    if (analysis.tone) {
+        parts.push(renderSection('Tone & Intensity', '#f59e0b', analysis.tone));
+    }
+    if (analysis.context) {
+        parts.push(renderSection('Context & Aspects', '#8b5cf6', analysis.context));
+    }
+    if (analysis.evidence) {
+        parts.push(renderSection('Evidence & Specific Words', '#06b6d4', analysis.evidence, ' font-style: italic;'));
+    }
+
+    if (data.probabilities) {
+        const diff = Math.abs(data.probabilities.positive - data.probabilities.negative);
+        if (diff < 0.3) {
+            parts.push(
+                '<div style="margin-top: 15px; padding: 12px; background: #3a2a1a; border-radius: 6px; border-left: 3px solid #f59e0b;">' +
+                '<p style="color: #fbbf24; font-weight: bold; margin-bottom: 6px;">Mixed Sentiment Detected</p>' +
+                '<p style="color: #e0e0e0; font-size: 0.9em; line-height: 1.6;">' +
+                'This text contains balanced positive and negative elements (confidence difference less than 30%). ' +
+                'Consider breaking it into separate sentences for more granular analysis of different aspects.' +
+                '</p></div>'
+            );
+        }
+    }
+
+    parts.push('</div>');
+    return parts.join('');
+}
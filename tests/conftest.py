@@ -1,21 +1,54 @@
 """
 Test configuration
 """
-import pytest
+import re
 import asyncio
+import pytest
+from functools import lru_cache
 from unittest.mock import MagicMock
+from httpx import AsyncClient, ASGITransport
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+# Keywords for the rule-based mock model
+POSITIVE_WORDS = frozenset(['amazing', 'love', 'great', 'excellent', 'wonderful', 'fantastic'])
+NEGATIVE_WORDS = frozenset(['terrible', 'hate', 'awful', 'bad', 'worst', 'horrible'])
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+# The mock's output depends only on which keyword sets a text hits, so
+# paraphrases already share one of three results; the cache just skips the
+# tokenizing for repeated texts. The real model is never wrapped this way, as
+# test_model_inference.py is there to check its actual predictions.
+@lru_cache(maxsize=8192)
+def _classify(text):
+    """Return (sentiment, confidence, positive probability) for text"""
+    tokens = set(_WORD_RE.findall(text.lower()))
+    has_positive = not tokens.isdisjoint(POSITIVE_WORDS)
+    has_negative = not tokens.isdisjoint(NEGATIVE_WORDS)
+    
+    if has_positive and not has_negative:
+        return "positive", 0.9999, 0.9999
+    if has_negative and not has_positive:
+        return "negative", 0.9999, 0.0001
+    return "positive", 0.6, 0.6  # default
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy():
+    """Run async tests on uvloop when installed (uvicorn[standard] pulls it in off Windows)"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
 
 
-@pytest.fixture(autouse=True)
-def mock_model(monkeypatch):
+@pytest.fixture(scope="session")
+def shared_mock_model():
     """Mock the sentiment model to avoid loading heavy model in tests"""
     
     # Create a mock model instance
@@ -26,25 +59,7 @@ def mock_model(monkeypatch):
     # Mock the predict method
     async def mock_predict(text, return_probabilities=False):
         # Simple rule-based mock for testing
-        positive_words = ['amazing', 'love', 'great', 'excellent', 'wonderful', 'fantastic']
-        negative_words = ['terrible', 'hate', 'awful', 'bad', 'worst', 'horrible']
-        
-        text_lower = text.lower()
-        has_positive = any(word in text_lower for word in positive_words)
-        has_negative = any(word in text_lower for word in negative_words)
-        
-        if has_positive and not has_negative:
-            sentiment = "positive"
-            confidence = 0.9999
-            pos_prob = 0.9999
-        elif has_negative and not has_positive:
-            sentiment = "negative"
-            confidence = 0.9999
-            pos_prob = 0.0001
-        else:
-            sentiment = "positive"  # default
-            confidence = 0.6
-            pos_prob = 0.6
+        sentiment, confidence, pos_prob = _classify(text)
         
         result = {
             "sentiment": sentiment,
@@ -61,6 +76,12 @@ def mock_model(monkeypatch):
     
     mock_instance.predict = mock_predict
     
+    # Mock the batched predict method
+    async def mock_predict_many(texts, return_probabilities=False):
+        return [await mock_predict(text, return_probabilities) for text in texts]
+    
+    mock_instance.predict_many = mock_predict_many
+    
     # Mock load method
     async def mock_load():
         mock_instance.is_loaded = True
@@ -77,9 +98,57 @@ def mock_model(monkeypatch):
     
     mock_instance.get_info = mock_get_info
     
-    # Patch the model instance in app.main
+    return mock_instance
+
+
+@pytest.fixture(autouse=True)
+def mock_model(shared_mock_model, monkeypatch):
+    """Patch the shared mock model into app.main for each test"""
     from app import main
-    monkeypatch.setattr(main, "model", mock_instance)
+    shared_mock_model.is_loaded = True
+    monkeypatch.setattr(main, "model", shared_mock_model)
     
-    return mock_instance
+    return shared_mock_model
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    One ASGI test client for the whole session
+    
+    ASGITransport calls the app in whichever loop the test runs on, so the
+    client is built synchronously and reused across per-test event loops.
+    """
+    from app.main import app
+    
+    api_client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    yield api_client
+    asyncio.run(api_client.aclose())
+
+
+async def _call_predict(**fields):
+    """Run the predict handler in-process, returning the JSON-shaped response"""
+    from app.main import predict, PredictionRequest
+    
+    response = await predict(PredictionRequest(**fields))
+    return response.model_dump(exclude_none=True)
+
+
+async def _call_predict_batch(**fields):
+    """Run the batch predict handler in-process, returning the JSON-shaped response"""
+    from app.main import predict_batch, BatchPredictionRequest
+    
+    response = await predict_batch(BatchPredictionRequest(**fields))
+    return response.model_dump(exclude_none=True)
+
+
+@pytest.fixture
+def call_predict():
+    """Call /api/v1/predict without going through HTTP, for payload-only tests"""
+    return _call_predict
+
 
+@pytest.fixture
+def call_predict_batch():
+    """Call /api/v1/predict/batch without going through HTTP, for payload-only tests"""
+    return _call_predict_batch
@@ -1,16 +1,69 @@
 """
 Unit tests for the sentiment analysis API
 """
+import asyncio
+import gzip
+import json
+import numpy as np
+import orjson
 import pytest
-from httpx import AsyncClient, ASGITransport
-from app.main import app
-
-
-@pytest.mark.asyncio
-async def test_health_check():
+import pytest_asyncio
+from pydantic import ValidationError
+from app.main import BatchPredictionRequest, PredictionRequest
+
+# Pre-encoded body for the long-text case, built once at import
+LONG_TEXT_PAYLOAD = orjson.dumps({"text": "This is great! " * 100})
+
+# Requests whose tests only inspect the response; they are independent of each
+# other, so they are sent together once and each test reads its own response
+_INDEPENDENT_REQUESTS = {
+    "health": ("GET", "/health", {}),
+    "root": ("GET", "/", {}),
+    "text_long": ("POST", "/api/v1/predict", {
+        "content": LONG_TEXT_PAYLOAD,
+        "headers": {"Content-Type": "application/json"}
+    }),
+    "gzip_body": ("POST", "/api/v1/predict/batch", {
+        "content": gzip.compress(json.dumps({"texts": ["I love this!", "This is terrible"]}).encode()),
+        "headers": {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    }),
+    "gzip_body_invalid": ("POST", "/api/v1/predict/batch", {
+        "content": b"not gzip",
+        "headers": {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    }),
+    "gzip_response_batch": ("POST", "/api/v1/predict/batch", {
+        "json": {"texts": ["I love this product, it is great!"] * 20},
+        "headers": {"Accept-Encoding": "gzip"}
+    }),
+    "gzip_response_single": ("POST", "/api/v1/predict", {
+        "json": {"text": "I love this!"},
+        "headers": {"Accept-Encoding": "gzip"}
+    }),
+    "json_invalid": ("POST", "/api/v1/predict", {
+        "content": b'{"text": ',
+        "headers": {"Content-Type": "application/json"}
+    }),
+}
+
+
+@pytest_asyncio.fixture(scope="module")
+async def api_responses(client, shared_mock_model):
+    """Send every request in _INDEPENDENT_REQUESTS concurrently, keyed by name"""
+    from app import main
+    
+    # Module fixtures are set up before the autouse mock_model patch, so patch here too
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(main, "model", shared_mock_model)
+        responses = await asyncio.gather(*(
+            client.request(method, url, **kwargs)
+            for method, url, kwargs in _INDEPENDENT_REQUESTS.values()
+        ))
+    return dict(zip(_INDEPENDENT_REQUESTS, responses))
+
+
+def test_health_check(api_responses):
     """Test health check endpoint"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/health")
+    response = api_responses["health"]
     
     assert response.status_code == 200
     data = response.json()
@@ -19,11 +72,9 @@ async def test_health_check():
     assert "version" in data
 
 
-@pytest.mark.asyncio
-async def test_root_endpoint():
+def test_root_endpoint(api_responses):
     """Test root endpoint"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/")
+    response = api_responses["root"]
     
     assert response.status_code == 200
     data = response.json()
@@ -32,19 +83,13 @@ async def test_root_endpoint():
 
 
 @pytest.mark.asyncio
-async def test_predict_positive_sentiment():
-    """Test prediction with positive text"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={
-                "text": "This is amazing! I love it!",
-                "return_probabilities": True
-            }
-        )
-    
-    assert response.status_code == 200
-    data = response.json()
+@pytest.mark.parametrize("text,return_probabilities", [
+    ("This is amazing! I love it!", True),
+    ("This is terrible. I hate it!", False),
+])
+async def test_predict_sentiment(call_predict, text, return_probabilities):
+    """Test prediction with positive and negative text"""
+    data = await call_predict(text=text, return_probabilities=return_probabilities)
     
     assert "sentiment" in data
     assert "confidence" in data
@@ -53,135 +98,83 @@ async def test_predict_positive_sentiment():
     assert data["sentiment"] in ["positive", "negative"]
     assert 0 <= data["confidence"] <= 1
     assert data["latency_ms"] > 0
+    assert ("probabilities" in data) == return_probabilities
 
 
 @pytest.mark.asyncio
-async def test_predict_negative_sentiment():
-    """Test prediction with negative text"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={
-                "text": "This is terrible. I hate it!",
-                "return_probabilities": False
-            }
-        )
-    
-    assert response.status_code == 200
-    data = response.json()
-    
-    assert "sentiment" in data
-    assert data["sentiment"] in ["positive", "negative"]
-
-
-@pytest.mark.asyncio
-async def test_predict_with_request_id():
+async def test_predict_with_request_id(call_predict):
     """Test prediction with custom request ID"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={
-                "text": "Good product",
-                "request_id": "test_123"
-            }
-        )
+    data = await call_predict(text="Good product", request_id="test_123")
     
-    assert response.status_code == 200
-    data = response.json()
     assert data["request_id"] == "test_123"
 
 
-@pytest.mark.asyncio
-async def test_predict_empty_text():
-    """Test prediction with empty text (should fail)"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={"text": ""}
-        )
-    
-    assert response.status_code == 422  # Validation error
+@pytest.mark.parametrize("text", ["", "   "])
+def test_predict_text_validation(text):
+    """Test that empty and whitespace-only text are rejected"""
+    with pytest.raises(ValidationError):
+        PredictionRequest(text=text)
 
 
-@pytest.mark.asyncio
-async def test_predict_whitespace_only():
-    """Test prediction with whitespace-only text (should fail)"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={"text": "   "}
-        )
-    
-    assert response.status_code == 422
+def test_predict_long_text(api_responses):
+    """Test prediction with very long text"""
+    assert api_responses["text_long"].status_code == 200
 
 
 @pytest.mark.asyncio
-async def test_predict_long_text():
-    """Test prediction with very long text"""
-    long_text = "This is great! " * 100
+@pytest.mark.parametrize("batch_size", [3, 32, 100])  # 100 is the request limit
+async def test_batch_prediction(call_predict_batch, batch_size):
+    """Test batch prediction endpoint"""
+    base = ["I love this!", "This is terrible", "It's okay, I guess"]
+    texts = [base[i % len(base)] for i in range(batch_size)]
+    data = await call_predict_batch(texts=texts, return_probabilities=True)
     
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={"text": long_text}
-        )
+    assert "predictions" in data
+    assert "total_latency_ms" in data
+    predictions = data["predictions"]
+    assert len(predictions) == batch_size
     
-    assert response.status_code == 200
+    assert all(pred.keys() >= {"sentiment", "confidence", "probabilities"} for pred in predictions)
+    confidences = np.array([pred["confidence"] for pred in predictions])
+    assert np.all((confidences >= 0) & (confidences <= 1))
 
 
-@pytest.mark.asyncio
-async def test_batch_prediction():
-    """Test batch prediction endpoint"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict/batch",
-            json={
-                "texts": [
-                    "I love this!",
-                    "This is terrible",
-                    "It's okay, I guess"
-                ],
-                "return_probabilities": True
-            }
-        )
+def test_batch_prediction_gzip_body(api_responses):
+    """Test that gzip-compressed request bodies are accepted"""
+    response = api_responses["gzip_body"]
     
     assert response.status_code == 200
-    data = response.json()
-    
-    assert "predictions" in data
-    assert "total_latency_ms" in data
-    assert len(data["predictions"]) == 3
+    assert len(response.json()["predictions"]) == 2
+    assert api_responses["gzip_body_invalid"].status_code == 400
+
+
+def test_batch_prediction_gzip_response(api_responses):
+    """Test that large responses are gzip-compressed when the client accepts it"""
+    response = api_responses["gzip_response_batch"]
     
-    for pred in data["predictions"]:
-        assert "sentiment" in pred
-        assert "confidence" in pred
-        assert "probabilities" in pred
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["predictions"]) == 20
+    assert "content-encoding" not in api_responses["gzip_response_single"].headers
 
 
-@pytest.mark.asyncio
-async def test_batch_prediction_empty_list():
+def test_batch_prediction_empty_list():
     """Test batch prediction with empty list (should fail)"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict/batch",
-            json={"texts": []}
-        )
-    
-    assert response.status_code == 422
+    with pytest.raises(ValidationError):
+        BatchPredictionRequest(texts=[])
 
 
 @pytest.mark.asyncio
-async def test_metrics_endpoint():
+async def test_metrics_endpoint(client):
     """Test metrics endpoint"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        # Make a prediction first
-        await client.post(
-            "/api/v1/predict",
-            json={"text": "Test text"}
-        )
-        
-        # Get metrics
-        response = await client.get("/metrics")
+    # Make a prediction first (sequential: the metrics call must see it)
+    await client.post(
+        "/api/v1/predict",
+        json={"text": "Test text"}
+    )
+    
+    # Get metrics
+    response = await client.get("/metrics")
     
     assert response.status_code == 200
     data = response.json()
@@ -195,20 +188,18 @@ async def test_metrics_endpoint():
 
 
 @pytest.mark.asyncio
-async def test_probabilities_sum_to_one():
+async def test_probabilities_sum_to_one(call_predict):
     """Test that probabilities sum to approximately 1.0"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/predict",
-            json={
-                "text": "This is a test",
-                "return_probabilities": True
-            }
-        )
-    
-    assert response.status_code == 200
-    data = response.json()
+    data = await call_predict(text="This is a test", return_probabilities=True)
     
     if "probabilities" in data and data["probabilities"]:
         total = sum(data["probabilities"].values())
         assert abs(total - 1.0) < 0.01  # Allow small floating point error
+
+
+def test_predict_malformed_json(api_responses):
+    """Test that a body that is not valid JSON is rejected as a validation error"""
+    response = api_responses["json_invalid"]
+    
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
@@ -0,0 +1,52 @@
+"""
+Tests for the LLM response cache
+"""
+from app.llm_cache import LLMCache
+
+
+def test_cache_miss_then_hit():
+    """Test that a stored value is returned on the next lookup"""
+    cache = LLMCache()
+    key = LLMCache.make_key("explain_sentiment", "model", "prompt")
+    
+    assert cache.get(key) is None
+    cache.set(key, {"explanation": "cached"})
+    
+    assert cache.get(key) == {"explanation": "cached"}
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_key_depends_on_all_inputs():
+    """Test that method, model and prompt all affect the key"""
+    base = LLMCache.make_key("explain_sentiment", "model", "prompt")
+    
+    assert base == LLMCache.make_key("explain_sentiment", "model", "prompt")
+    assert base != LLMCache.make_key("analyze_batch_insights", "model", "prompt")
+    assert base != LLMCache.make_key("explain_sentiment", "other", "prompt")
+    assert base != LLMCache.make_key("explain_sentiment", "model", "other")
+
+
+def test_cache_expiry():
+    """Test that expired entries are not returned"""
+    cache = LLMCache(ttl=-1)
+    key = LLMCache.make_key("m", "model", "prompt")
+    
+    cache.set(key, {"value": 1})
+    
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the oldest entry is evicted when full"""
+    cache = LLMCache(maxsize=2)
+    
+    cache.set(b"a", {"value": "a"})
+    cache.set(b"b", {"value": "b"})
+    cache.get(b"a")
+    cache.set(b"c", {"value": "c"})
+    
+    assert cache.get(b"a") is not None
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") is not None
@@ -1,9 +1,15 @@
 """
 Tests for metrics collection
 """
+import time
+
 import pytest
 from app.metrics import MetricsCollector
 
+# Collectors are small fixed-size buffers; more than this means the latency
+# window is growing again
+pytestmark = pytest.mark.limit_memory("50 MB")
+
 
 def test_metrics_initialization():
     """Test metrics collector initialization"""
@@ -56,6 +62,36 @@ def test_get_stats():
     assert stats['max_latency_ms'] == 200.0
 
 
+def test_latency_window_eviction():
+    """Test that stats only cover the most recent latency samples"""
+    metrics = MetricsCollector()
+    
+    metrics.record_request(5000.0, True)
+    for _ in range(1000):
+        metrics.record_request(10.0, True)
+    
+    stats = metrics.get_stats()
+    
+    assert len(metrics.latencies) == 1000
+    assert stats['average_latency_ms'] == 10.0
+    assert stats['max_latency_ms'] == 10.0
+    assert stats['min_latency_ms'] == 10.0
+
+
+def test_record_cache_lookup():
+    """Test prediction cache hit/miss counters"""
+    metrics = MetricsCollector()
+    
+    metrics.record_cache_lookup(hit=False)
+    metrics.record_cache_lookup(hit=True)
+    metrics.record_cache_lookup(hit=True)
+    
+    stats = metrics.get_stats()
+    
+    assert stats['cache_hits'] == 2
+    assert stats['cache_misses'] == 1
+
+
 def test_reset_metrics():
     """Test resetting metrics"""
     metrics = MetricsCollector()
@@ -67,3 +103,50 @@ def test_reset_metrics():
     assert metrics.successful_requests == 0
     assert metrics.failed_requests == 0
     assert len(metrics.latencies) == 0
+
+
+def test_metrics_from_multiple_threads():
+    """Test that per-thread shards are combined in the stats"""
+    import threading
+    
+    metrics = MetricsCollector()
+    
+    def worker():
+        for _ in range(100):
+            metrics.record_request(10.0, True)
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    stats = metrics.get_stats()
+    
+    assert stats['total_requests'] == 400
+    assert stats['successful_requests'] == 400
+    assert stats['average_latency_ms'] == 10.0
+
+
+# record_request calls per benchmark round, and the budget for one round
+BENCH_RECORDS = 100_000
+BENCH_BUDGET_S = 0.5
+
+
+@pytest.mark.benchmark(group="metrics")
+def test_record_request_perf(benchmark):
+    """Test that record_request stays within its per-call budget"""
+    metrics = MetricsCollector()
+    durations = []
+    
+    def record_many():
+        start = time.perf_counter()
+        for _ in range(BENCH_RECORDS):
+            metrics.record_request(1.0, True)
+        durations.append(time.perf_counter() - start)
+    
+    benchmark.pedantic(record_many, rounds=3, iterations=1)
+    
+    # pytest-benchmark turns itself off under xdist but still makes one call,
+    # so the budget is checked against the rounds timed here
+    assert min(durations) < BENCH_BUDGET_S
@@ -0,0 +1,30 @@
+"""
+Tests for the mock LLM enhancer
+"""
+import pytest
+from app.mock_llm import MockLLMEnhancer
+
+
+@pytest.mark.parametrize("text,language", [
+    ("This is a plain English sentence", "en"),
+    ("Это отличный продукт", "ru"),
+    ("هذا منتج رائع", "ar"),
+    ("这个产品很好", "zh"),
+    ("Привет 你好", "zh"),
+])
+def test_detect_language(text, language):
+    """Test script-based language detection and its priority order"""
+    result = MockLLMEnhancer.detect_language(text)
+    
+    assert result["language"] == language
+    assert result["is_english"] == (language == "en")
+    assert result["translated_text"] == text
+
+
+def test_explain_sentiment_key_phrases():
+    """Test that key phrases are matched case-insensitively in list order"""
+    result = MockLLMEnhancer.explain_sentiment("GREAT value, I Love It. Amazing!", "positive", 0.99)
+    assert result["key_phrases"] == ["amazing", "love it", "great"]
+    
+    result = MockLLMEnhancer.explain_sentiment("Nothing notable here", "negative", 0.8)
+    assert result["key_phrases"] == ["negative language", "critical tone"]
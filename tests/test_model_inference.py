@@ -0,0 +1,147 @@
+"""
+Unit tests for predictions from the model wrapper
+"""
+import asyncio
+import pytest
+import pytest_asyncio
+import platform
+from app.metrics import MetricsCollector
+
+# Skip the whole module, instead of failing collection, without the ML stack
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from app.model import SentimentModel
+
+# Skip model tests on macOS due to PyTorch bus error
+skip_on_macos = pytest.mark.skipif(
+    platform.system() == "Darwin",
+    reason="PyTorch model tests cause bus errors on macOS. Run in Docker instead."
+)
+
+
+@pytest_asyncio.fixture(scope="module")
+async def loaded_model():
+    """
+    Real SentimentModel loaded once for this module
+    
+    Its batching task lives on the module event loop, so tests using it
+    must be marked @pytest.mark.asyncio(scope="module").
+    """
+    model = SentimentModel()
+    await model.load()
+    yield model
+    await model.unload()
+
+
+@skip_on_macos
+@pytest.mark.asyncio(scope="module")
+async def test_model_prediction(loaded_model):
+    """Test basic prediction"""
+    result = await loaded_model.predict("This is great!")
+    
+    assert "sentiment" in result
+    assert "confidence" in result
+    assert result["sentiment"] in ["positive", "negative"]
+    assert 0 <= result["confidence"] <= 1
+
+
+@skip_on_macos
+@pytest.mark.asyncio(scope="module")
+async def test_model_prediction_with_probabilities(loaded_model):
+    """Test prediction with probability output"""
+    result = await loaded_model.predict("Excellent product!", return_probabilities=True)
+    
+    assert "probabilities" in result
+    assert isinstance(result["probabilities"], dict)
+    assert len(result["probabilities"]) > 0
+
+
+@skip_on_macos
+@pytest.mark.asyncio(scope="module")
+async def test_model_predict_many(loaded_model):
+    """Test batched prediction keeps input order"""
+    results = await loaded_model.predict_many(["I love this!", "This is terrible."])
+    
+    assert len(results) == 2
+    assert results[0]["sentiment"] == "positive"
+    assert results[1]["sentiment"] == "negative"
+
+
+@pytest.mark.asyncio
+async def test_predict_many_uses_cache():
+    """Test that repeated texts skip the pipeline"""
+    metrics = MetricsCollector()
+    model = SentimentModel(metrics=metrics)
+    model.is_loaded = True
+    calls = []
+    
+    def fake_pipeline(texts):
+        calls.append(list(texts))
+        return [{"POSITIVE": 0.9, "NEGATIVE": 0.1} for _ in texts]
+    
+    model._run_pipeline = fake_pipeline
+    
+    await model.predict_many(["a", "b"])
+    results = await model.predict_many(["b", "c"], return_probabilities=True)
+    
+    assert calls == [["a", "b"], ["c"]]
+    assert results[0]["probabilities"]["positive"] == 0.9
+    assert metrics.cache_hits == 1
+    assert metrics.cache_misses == 3
+
+
+@pytest.mark.asyncio
+async def test_predict_uses_cache():
+    """Test that repeating a text through predict() skips the batch worker"""
+    model = SentimentModel()
+    calls = []
+    
+    def fake_pipeline(texts):
+        calls.append(list(texts))
+        return [{"POSITIVE": 0.2, "NEGATIVE": 0.8} for _ in texts]
+    
+    model._run_pipeline = fake_pipeline
+    model._queue = asyncio.Queue()
+    model._batcher_task = asyncio.create_task(model._batch_loop())
+    model.is_loaded = True
+    
+    first = await model.predict("Good product")
+    second = await model.predict("Good product", return_probabilities=True)
+    await model.unload()
+    
+    assert calls == [["Good product"]]
+    assert first["sentiment"] == second["sentiment"] == "negative"
+    assert second["probabilities"]["negative"] == 0.8
+
+
+def test_run_pipeline_sorts_long_inputs_by_length(monkeypatch):
+    """Test that multi-chunk inputs reach the pipeline sorted by length but return in order"""
+    monkeypatch.setattr("app.model.MAX_PIPELINE_BATCH_SIZE", 2)
+    model = SentimentModel()
+    seen = []
+    
+    def fake_pipeline(texts, **kwargs):
+        seen.extend(texts)
+        return [
+            [{"label": "POSITIVE", "score": len(text) / 10}, {"label": "NEGATIVE", "score": 1 - len(text) / 10}]
+            for text in texts
+        ]
+    
+    model.pipeline = fake_pipeline
+    texts = ["aaaa", "a", "aaa", "aa"]
+    results = model._run_pipeline(texts)
+    
+    assert seen == ["a", "aa", "aaa", "aaaa"]
+    assert [result["POSITIVE"] for result in results] == [0.4, 0.1, 0.3, 0.2]
+
+
+@skip_on_macos
+@pytest.mark.asyncio(scope="module")
+async def test_model_info(loaded_model):
+    """Test model info retrieval"""
+    info = loaded_model.get_info()
+    
+    assert "model_name" in info
+    assert "device" in info
+    assert "status" in info
+    assert info["status"] == "loaded"
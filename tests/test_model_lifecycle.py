@@ -0,0 +1,41 @@
+"""
+Unit tests for loading and unloading the model wrapper
+"""
+import pytest
+import platform
+
+# Skip the whole module, instead of failing collection, without the ML stack
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from app.model import SentimentModel
+
+# Skip model tests on macOS due to PyTorch bus error
+skip_on_macos = pytest.mark.skipif(
+    platform.system() == "Darwin",
+    reason="PyTorch model tests cause bus errors on macOS. Run in Docker instead."
+)
+
+
+@skip_on_macos
+@pytest.mark.limit_memory("1 GB")
+@pytest.mark.asyncio
+async def test_model_loading():
+    """Test model loading and unloading"""
+    model = SentimentModel()
+    assert not model.is_loaded
+    
+    await model.load()
+    assert model.is_loaded
+    
+    await model.unload()
+    assert not model.is_loaded
+
+
+@skip_on_macos
+@pytest.mark.asyncio
+async def test_prediction_without_loading():
+    """Test that prediction fails when model not loaded"""
+    model = SentimentModel()
+    
+    with pytest.raises(RuntimeError):
+        await model.predict("test")
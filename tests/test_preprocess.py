@@ -0,0 +1,21 @@
+"""
+Tests for client-side text preprocessing
+"""
+import pytest
+from preprocess import normalize, normalize_many
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("  This IS   Great!\n", "this is great!"),
+    ("See https://example.com/x now", "see now"),
+    ("Tabs\tand\r\nnewlines", "tabs and newlines"),
+    ("ÜBER gut", "über gut"),
+])
+def test_normalize(text, expected):
+    """Test lowercasing, URL removal, and whitespace collapsing"""
+    assert normalize(text) == expected
+
+
+def test_normalize_many_drops_empty():
+    """Test that texts which normalize to nothing are dropped"""
+    assert normalize_many(["Hello", "   ", "http://only.url"]) == ["hello"]
@@ -0,0 +1,50 @@
+"""
+Tests for LLM provider rate limiting
+"""
+import pytest
+from app.rate_limit import AsyncTokenBucket, ProviderRateLimiter, is_rate_limit_error
+
+
+class RateLimitError(Exception):
+    """Stand-in for an SDK 429 exception"""
+    status_code = 429
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_consumes_tokens():
+    """Test that acquiring tokens drains the bucket"""
+    bucket = AsyncTokenBucket(capacity=10, refill_per_second=1)
+    
+    await bucket.acquire(4)
+    
+    assert bucket._tokens == pytest.approx(6, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_limiter_halves_concurrency_on_rate_limit():
+    """Test multiplicative decrease after a 429"""
+    limiter = ProviderRateLimiter(rpm=600, tpm=100000, max_concurrency=8)
+    
+    with pytest.raises(RateLimitError):
+        async with limiter.limit(100):
+            raise RateLimitError()
+    
+    assert limiter.concurrency == 4.0
+
+
+@pytest.mark.asyncio
+async def test_limiter_restores_concurrency_on_success():
+    """Test additive increase after successful calls"""
+    limiter = ProviderRateLimiter(rpm=600, tpm=100000, max_concurrency=8)
+    limiter.concurrency = 2.0
+    
+    async with limiter.limit(100):
+        pass
+    
+    assert limiter.concurrency == 2.5
+
+
+def test_is_rate_limit_error():
+    """Test detection of provider rate-limit exceptions"""
+    assert is_rate_limit_error(RateLimitError())
+    assert not is_rate_limit_error(ValueError("bad request"))